@@ -19,9 +19,21 @@ Version: 2.0.0
 License: MIT
 """
 
+import asyncio
+import copy
+import sys
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# Successful generations are reused for identical requests for a short while
+_GENERATION_CACHE_MAX = 256
+_GENERATION_CACHE_TTL = 300.0
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain dataclasses
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class LLMProvider(Enum):
@@ -49,7 +61,7 @@ class CodeType(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CodeGenerationRequest:
     """Request structure for AI code generation."""
 
@@ -64,7 +76,7 @@ class CodeGenerationRequest:
     project_structure: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AnalysisRequest:
     """Request structure for AI code analysis."""
 
@@ -89,10 +101,16 @@ class LLMIntegration:
         self.security_manager = security_manager
         self.provider = LLMProvider.CALLING_LLM
         self.project_context: Dict[str, Any] = {}
+        # LRU of (timestamp, result) per request key, with a lock per key in flight
+        self._generation_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._generation_locks: Dict[Tuple, asyncio.Lock] = {}
 
     def set_project_context(self, context: Dict[str, Any]) -> None:
         """Set project context for better code generation."""
         self.project_context = context
+        # Prompts include the project context, so earlier results no longer apply
+        self._generation_cache.clear()
+        self._generation_locks.clear()
 
     async def generate_code_with_ai(self, request: CodeGenerationRequest) -> Dict[str, Any]:
         """
@@ -102,23 +120,66 @@ class LLMIntegration:
         using hardcoded templates, it crafts detailed prompts for the calling LLM
         to generate contextually appropriate, production-ready code.
 
+        Successful results are cached for identical requests; concurrent identical
+        requests wait for the first one instead of calling the LLM again.
+
         Args:
             request: Code generation request with specifications
 
         Returns:
             Dict containing generated code, explanations, and metadata
         """
+        # Log the generation request for audit
+        if self.security_manager:
+            self.security_manager.log_audit_event(
+                "ai_code_generation",
+                f"type:{request.code_type.value}, class:{request.class_name}",
+            )
+
+        key = self._generation_cache_key(request)
+        if key is None:
+            return await self._generate_code_uncached(request)
+
+        lock = self._generation_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._generation_cache.get(key)
+            if cached and time.monotonic() - cached[0] < _GENERATION_CACHE_TTL:
+                self._generation_cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+
+            result = await self._generate_code_uncached(request)
+            if result.get("success"):
+                self._generation_cache[key] = (time.monotonic(), copy.deepcopy(result))
+                self._generation_cache.move_to_end(key)
+                while len(self._generation_cache) > _GENERATION_CACHE_MAX:
+                    evicted, _ = self._generation_cache.popitem(last=False)
+                    self._generation_locks.pop(evicted, None)
+
+        if key not in self._generation_cache:
+            self._generation_locks.pop(key, None)
+        return result
+
+    @staticmethod
+    def _generation_cache_key(request: CodeGenerationRequest) -> Optional[Tuple]:
+        """Build a hashable cache key, or None if the request should not be cached."""
+        if request.context or request.project_structure:
+            return None
+        return (
+            request.code_type,
+            request.class_name,
+            request.package_name,
+            request.framework,
+            request.description,
+            tuple(request.features or ()),
+            tuple(request.compliance_requirements or ()),
+        )
+
+    async def _generate_code_uncached(self, request: CodeGenerationRequest) -> Dict[str, Any]:
+        """Run the generation pipeline for a request without consulting the cache."""
         try:
             # Build comprehensive context for the LLM
             llm_prompt = self._build_generation_prompt(request)
 
-            # Log the generation request for audit
-            if self.security_manager:
-                self.security_manager.log_audit_event(
-                    "ai_code_generation",
-                    f"type:{request.code_type.value}, class:{request.class_name}",
-                )
-
             # Generate code using the calling LLM
             generated_code = await self._call_llm_for_generation(llm_prompt, request)
 
@@ -25,7 +25,8 @@ import os
 import httpx
 import shutil
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, FrozenSet, List, Mapping, Optional, Tuple
 
 from ai.llm_integration import AnalysisRequest, CodeGenerationRequest, CodeType, LLMIntegration
 from generators.kotlin_generator import KotlinCodeGenerator
@@ -37,9 +38,281 @@ from tools.project_analysis import ProjectAnalysisTools
 from utils.security import SecurityManager
 
 
+# Dependency-name keywords mapped to the project feature they indicate
+_FEATURE_KEYWORDS = (
+    ("hilt", "hilt"),
+    ("room", "room"),
+    ("retrofit", "retrofit"),
+    ("compose", "compose"),
+    ("lifecycle-viewmodel", "viewmodel"),
+    ("kotlinx-coroutines", "coroutines"),
+    ("navigation-compose", "navigation"),
+)
+
+
+# Shared stand-in for tool calls made without arguments
+_EMPTY_ARGS: Mapping[str, Any] = MappingProxyType({})
+
+# Name-independent part of the MCP initialize result, shared by every handshake
+_INITIALIZE_RESULT: Mapping[str, Any] = MappingProxyType(
+    {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {
+            "resources": {
+                "subscribe": False,
+                "listChanged": False,
+            },
+            "tools": {},
+            "logging": {},
+        },
+    }
+)
+_SERVER_VERSION = "2.0.0"
+
+# JSON-RPC 2.0 error codes used in tool call responses
+_INVALID_PARAMS = -32602
+_METHOD_NOT_FOUND = -32601
+_SERVER_ERROR = -32000
+
+
+def _jsonrpc_error(code: int, message: str, data: Optional[Any] = None) -> dict:
+    """Build a JSON-RPC 2.0 error response."""
+    error: dict = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "error": error}
+
+
+# Tool name -> KotlinMCPServer handler method, resolved once per project in set_project_path
+_TOOL_HANDLERS = MappingProxyType(
+    {
+        "create_kotlin_file": "_create_kotlin_file",
+        "gradle": "handle_gradle_tool",
+        "project_analysis": "handle_project_analysis_tool",
+        "generate_code_with_ai": "_generate_code_with_ai",
+        "analyze_code_with_ai": "_analyze_code_with_ai",
+        "enhance_existing_code": "_enhance_existing_code",
+        "create_layout_file": "_create_layout_file",
+        "format_code": "_format_code",
+        "run_lint": "_run_lint",
+        "generate_docs": "_generate_docs",
+        "create_compose_component": "_create_compose_component",
+        "create_custom_view": "_create_custom_view",
+        "scaffold": "handle_scaffold_tool",
+        "setup_dependency_injection": "_setup_dependency_injection",
+        "setup_room_database": "_setup_room_database",
+        "setup_retrofit_api": "_setup_retrofit_api",
+        "encrypt_sensitive_data": "_encrypt_sensitive_data",
+        "implement_gdpr_compliance": "_implement_gdpr_compliance",
+        "implement_hipaa_compliance": "_implement_hipaa_compliance",
+        "setup_secure_storage": "_setup_secure_storage",
+        "query_llm": "_query_llm",
+        "manage_dependencies": "_manage_dependencies",
+        "manage_project_files": "_manage_project_files",
+        "setup_cloud_sync": "_setup_cloud_sync",
+        "setup_external_api": "_setup_external_api",
+        "call_external_api": "_call_external_api",
+        "generate_unit_tests": "_generate_unit_tests",
+        "setup_ui_testing": "_setup_ui_testing",
+        "file_system": "handle_file_system_tool",
+        "git": "handle_git_tool",
+        "debug": "handle_debug_tool",
+        "tickets": "handle_tickets_tool",
+        "design": "handle_design_tool",
+        "ci": "handle_ci_tool",
+    }
+)
+# Every tool name handle_call_tool dispatches, for callers that validate names up front
+TOOL_NAMES = frozenset(
+    (*_TOOL_HANDLERS, "analyze_and_refactor_project", "optimize_build_performance")
+)
+
+
+# Marks a spec parameter that must be supplied by the caller
+_REQUIRED = object()
+
+# Declarative descriptions of the AI-backed setup tools. Each entry lists the tool
+# arguments (with defaults) that are substituted into the description and class name.
+_AI_SETUP_SPECS = {
+    "dependency_injection": {
+        "params": (("injection_type", "hilt"), ("modules", ("app", "network", "database"))),
+        "description": """
+            Set up {injection_type} dependency injection with the following modules:
+            Modules: {modules}
+
+            Create:
+            1. Application class with DI setup
+            2. Module classes for each specified module
+            3. Component interfaces if needed
+            4. Qualifier annotations
+            5. Provider methods for dependencies
+            6. Proper scoping annotations
+
+            Follow best practices for {injection_type}
+            """,
+        "code_type": CodeType.CUSTOM,
+        "package_name": "di",
+        "class_name": "DependencyInjection",
+        "features": ("hilt", "dependency_injection"),
+    },
+    "room_database": {
+        "params": (("database_name", _REQUIRED), ("entities", ()), ("version", 1)),
+        "description": """
+            Set up Room database with the following specifications:
+            Database Name: {database_name}
+            Entities: {entities}
+            Version: {version}
+
+            Create:
+            1. Entity classes with proper annotations
+            2. DAO interfaces with CRUD operations
+            3. Database class with Room configuration
+            4. Type converters if needed
+            5. Migration strategies
+            6. Repository integration
+
+            Use modern Room patterns and coroutines
+            """,
+        "code_type": CodeType.CUSTOM,
+        "package_name": "database",
+        "class_name": "{database_name}",
+        "features": ("room", "coroutines", "hilt"),
+    },
+    "retrofit_api": {
+        "params": (("api_name", _REQUIRED), ("base_url", _REQUIRED), ("endpoints", ())),
+        "description": """
+            Set up Retrofit API client with the following specifications:
+            API Name: {api_name}
+            Base URL: {base_url}
+            Endpoints: {endpoints}
+
+            Create:
+            1. API service interface with endpoints
+            2. Data models for requests/responses
+            3. Retrofit configuration with interceptors
+            4. Error handling
+            5. Authentication handling
+            6. Repository integration
+
+            Use modern networking patterns with coroutines
+            """,
+        "code_type": CodeType.CUSTOM,
+        "package_name": "network",
+        "class_name": "{api_name}",
+        "features": ("retrofit", "coroutines", "hilt"),
+    },
+    "encrypt_sensitive_data": {
+        "params": (("encryption_type", "aes"), ("data_types", ("user_data", "credentials"))),
+        "description": """
+            Implement {encryption_type} encryption for sensitive data:
+            Data Types: {data_types}
+
+            Create:
+            1. Encryption utility classes
+            2. Key management with Android Keystore
+            3. Secure data storage methods
+            4. Decryption utilities
+            5. Error handling for crypto operations
+            6. Proper key rotation strategies
+
+            Follow Android security best practices
+            """,
+        "code_type": CodeType.UTILITY_CLASS,
+        "package_name": "security",
+        "class_name": "DataEncryption",
+        "features": ("security", "encryption"),
+    },
+    "gdpr_compliance": {
+        "params": (("compliance_level", "basic"),),
+        "description": """
+            Implement GDPR compliance features at {compliance_level} level:
+
+            Create:
+            1. Consent management system
+            2. Data processing logging
+            3. User rights implementation (access, deletion, portability)
+            4. Privacy policy integration
+            5. Data retention policies
+            6. Audit trail mechanisms
+
+            Ensure full GDPR compliance for data handling
+            """,
+        "code_type": CodeType.UTILITY_CLASS,
+        "package_name": "compliance",
+        "class_name": "GDPRCompliance",
+        "features": ("gdpr", "privacy", "compliance"),
+    },
+    "hipaa_compliance": {
+        "params": (("security_level", "standard"),),
+        "description": """
+            Implement HIPAA compliance features at {security_level} security level:
+
+            Create:
+            1. PHI (Protected Health Information) handling
+            2. Access control and authentication
+            3. Audit logging for all PHI access
+            4. Encryption for data at rest and in transit
+            5. User access management
+            6. Breach detection and reporting
+
+            Ensure full HIPAA compliance for healthcare data
+            """,
+        "code_type": CodeType.UTILITY_CLASS,
+        "package_name": "compliance",
+        "class_name": "HIPAACompliance",
+        "features": ("hipaa", "healthcare", "security"),
+    },
+    "secure_storage": {
+        "params": (("storage_type", "preferences"),),
+        "description": """
+            Set up secure {storage_type} storage:
+
+            Create:
+            1. Encrypted storage wrapper
+            2. Android Keystore integration
+            3. Biometric authentication support
+            4. Secure backup strategies
+            5. Key rotation mechanisms
+            6. Storage integrity validation
+
+            Use Android security best practices
+            """,
+        "code_type": CodeType.UTILITY_CLASS,
+        "package_name": "storage",
+        "class_name": "SecureStorage",
+        "features": ("security", "encryption", "biometric"),
+    },
+}
+
+
+# Kotlin class type -> KotlinCodeGenerator method that renders it
+_KOTLIN_GENERATORS = {
+    "activity": "generate_complete_activity",
+    "viewmodel": "generate_complete_viewmodel",
+    "repository": "generate_complete_repository",
+    "fragment": "generate_complete_fragment",
+    "data_class": "generate_complete_data_class",
+    "use_case": "generate_complete_use_case",
+    "service": "generate_complete_service",
+    "adapter": "generate_complete_adapter",
+    "interface": "generate_complete_interface",
+    "class": "generate_complete_class",
+}
+
+
+def _write_text_file(path: Path, content: str) -> None:
+    """Write a UTF-8 text file, creating parent directories (blocking; run via to_thread)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
 class KotlinMCPServer:
     """Main MCP Server class that coordinates all tool modules."""
 
+    # Tool schemas shared by all instances, built on first tools/list request. A tuple, so
+    # callers always get their own list and cannot reorder or drop tools for others.
+    _tool_schemas: Optional[Tuple[dict, ...]] = None
+
     def __init__(self, name: str):
         """Initialize the MCP server with all tool modules."""
         self.name = name
@@ -54,6 +327,10 @@ class KotlinMCPServer:
         self.gradle_tools: Optional[GradleTools] = None
         self.project_analysis: Optional[ProjectAnalysisTools] = None
         self.build_optimization: Optional[BuildOptimizationTools] = None
+        self._tool_dispatch: Mapping[str, Any] = MappingProxyType({})
+        self._tool_names: FrozenSet[str] = frozenset()
+        self._available_tools: Tuple[str, ...] = ()
+        self._tools_ready = False
 
     def set_project_path(self, project_path: str) -> None:
         """Set the project path and initialize tool modules."""
@@ -63,27 +340,48 @@ class KotlinMCPServer:
         self.gradle_tools = GradleTools(self.project_path, self.security_manager)
         self.project_analysis = ProjectAnalysisTools(self.project_path, self.security_manager)
         self.build_optimization = BuildOptimizationTools(self.project_path, self.security_manager)
+        self._tool_dispatch = self._build_tool_dispatch()
+        # Checked before dispatch and reported with every unknown-tool error, so build once
+        self._tool_names = frozenset(self._tool_dispatch)
+        self._available_tools = tuple(sorted(self._tool_names))
+        self._tools_ready = all([self.gradle_tools, self.project_analysis, self.build_optimization])
+
+    def _build_tool_dispatch(self) -> Mapping[str, Any]:
+        """Map tool names to bound handlers so each call is a single dict lookup."""
+        dispatch = {
+            name: getattr(self, attr)
+            for name, attr in _TOOL_HANDLERS.items()
+            if hasattr(self, attr)
+        }
+        # Tools served directly by the tool modules
+        if self.project_analysis:
+            dispatch["analyze_and_refactor_project"] = (
+                self.project_analysis.analyze_and_refactor_project
+            )
+        if self.build_optimization:
+            dispatch["optimize_build_performance"] = (
+                self.build_optimization.optimize_build_performance
+            )
+        # Read-only view: the table is shared by concurrent calls and must not change
+        return MappingProxyType(dispatch)
 
     async def handle_initialize(self, params: dict) -> dict:
         """Handle MCP initialize request."""
         return {
-            "protocolVersion": "2025-06-18",
-            "capabilities": {
-                "resources": {
-                    "subscribe": False,
-                    "listChanged": False,
-                },
-                "tools": {},
-                "logging": {},
-            },
-            "serverInfo": {
-                "name": self.name,
-                "version": "2.0.0",
-            },
+            **_INITIALIZE_RESULT,
+            "serverInfo": {"name": self.name, "version": _SERVER_VERSION},
         }
 
     async def handle_list_tools(self) -> dict:
         """List all available tools from all modules."""
+        # The schemas are static, so build them once per process
+        if KotlinMCPServer._tool_schemas is None:
+            KotlinMCPServer._tool_schemas = tuple(self._build_tool_schemas())
+        return {"tools": list(KotlinMCPServer._tool_schemas)}
+
+    @staticmethod
+    def _build_tool_schemas() -> list:
+        """Build the JSON schema list describing every tool."""
         tools = [
             # Kotlin Code Generation Tools
             {
@@ -384,7 +682,7 @@ class KotlinMCPServer:
                     },
                     "required": ["sub_command", "repo"]
                 }
-            }
+            },
             # Build Optimization Tools
             {
                 "name": "optimize_build_performance",
@@ -985,7 +1283,7 @@ class KotlinMCPServer:
             }
         ]
 
-        return {"tools": tools}
+        return tools
 
     async def handle_gradle_tool(self, arguments: dict) -> dict:
         """Handle gradle tool calls."""
@@ -1024,139 +1322,82 @@ class KotlinMCPServer:
             # For other analysis types, we can call the old analyze_project method
             return await self.project_analysis.analyze_project(arguments)
 
-    async def handle_call_tool(self, name: str, arguments: dict) -> dict:
-        """Route tool calls to appropriate modules."""
-        try:
-            if not self.project_path:
-                return {
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32000, # Server error
-                        "message": "Error: No project path set. Please provide a project path when starting the server.",
-                    },
-                }
+    async def handle_call_tool(
+        self, name: str, arguments: Optional[Mapping[str, Any]] = None
+    ) -> dict:
+        """
+        Route tool calls to appropriate modules.
 
-            # Ensure tool modules are initialized
-            if not all([self.gradle_tools, self.project_analysis, self.build_optimization]):
-                return {
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32000, # Server error
-                        "message": "Error: Tool modules not properly initialized. Please set project path.",
-                    },
-                }
+        Missing or empty arguments are replaced with a shared read-only mapping, so
+        handlers must treat ``arguments`` as read-only.
+        """
+        arguments = arguments or _EMPTY_ARGS
+        try:
+            # Single flag check on the hot path; work out which error applies only on failure
+            if not self._tools_ready:
+                if not self.project_path:
+                    return _jsonrpc_error(
+                        _SERVER_ERROR,
+                        "Error: No project path set. Please provide a project path when starting the server.",
+                    )
+                return _jsonrpc_error(
+                    _SERVER_ERROR,
+                    "Error: Tool modules not properly initialized. Please set project path.",
+                )
 
             # Route to appropriate tool module
-            if name == "create_kotlin_file":
-                result = await self._create_kotlin_file(arguments)
-            elif name == "gradle" and self.gradle_tools:
-                result = await self.handle_gradle_tool(arguments)
-            elif name == "project_analysis" and self.project_analysis:
-                result = await self.handle_project_analysis_tool(arguments)
-            elif name == "analyze_and_refactor_project" and self.project_analysis:
-                result = await self.project_analysis.analyze_and_refactor_project(arguments)
-            elif name == "optimize_build_performance" and self.build_optimization:
-                result = await self.build_optimization.optimize_build_performance(arguments)
-            # AI/LLM Integration Tools
-            elif name == "generate_code_with_ai":
-                result = await self._generate_code_with_ai(arguments)
-            elif name == "analyze_code_with_ai":
-                result = await self._analyze_code_with_ai(arguments)
-            elif name == "enhance_existing_code":
-                result = await self._enhance_existing_code(arguments)
-            # Additional Tools for Feature Parity
-            elif name == "create_layout_file":
-                result = await self._create_layout_file(arguments)
-            elif name == "format_code":
-                result = await self._format_code(arguments)
-            elif name == "run_lint":
-                result = await self._run_lint(arguments)
-            elif name == "generate_docs":
-                result = await self._generate_docs(arguments)
-            elif name == "create_compose_component":
-                result = await self._create_compose_component(arguments)
-            elif name == "create_custom_view":
-                result = await self._create_custom_view(arguments)
-            elif name == "scaffold":
-                result = await self.handle_scaffold_tool(arguments)
-            elif name == "setup_dependency_injection":
-                result = await self._setup_dependency_injection(arguments)
-            elif name == "setup_room_database":
-                result = await self._setup_room_database(arguments)
-            elif name == "setup_retrofit_api":
-                result = await self._setup_retrofit_api(arguments)
-            elif name == "encrypt_sensitive_data":
-                result = await self._encrypt_sensitive_data(arguments)
-            elif name == "implement_gdpr_compliance":
-                result = await self._implement_gdpr_compliance(arguments)
-            elif name == "implement_hipaa_compliance":
-                result = await self._implement_hipaa_compliance(arguments)
-            elif name == "setup_secure_storage":
-                result = await self._setup_secure_storage(arguments)
-            elif name == "query_llm":
-                result = await self._query_llm(arguments)
-            elif name == "manage_dependencies":
-                result = await self._manage_dependencies(arguments)
-            elif name == "manage_project_files":
-                result = await self._manage_project_files(arguments)
-            elif name == "setup_cloud_sync":
-                result = await self._setup_cloud_sync(arguments)
-            elif name == "setup_external_api":
-                result = await self._setup_external_api(arguments)
-            elif name == "call_external_api":
-                result = await self._call_external_api(arguments)
-            elif name == "generate_unit_tests":
-                result = await self._generate_unit_tests(arguments)
-            elif name == "setup_ui_testing":
-                result = await self._setup_ui_testing(arguments)
-            elif name == "file_system":
-                result = await self.handle_file_system_tool(arguments)
-            elif name == "git":
-                result = await self.handle_git_tool(arguments)
-            elif name == "debug":
-                result = await self.handle_debug_tool(arguments)
-            elif name == "tickets":
-                result = await self.handle_tickets_tool(arguments)
-            elif name == "design":
-                result = await self.handle_design_tool(arguments)
-            elif name == "ci":
-                result = await self.handle_ci_tool(arguments)
-            else:
-                return {
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32601, # Method not found
-                        "message": f"Unknown tool: {name}",
-                    },
-                }
+            if name not in self._tool_names:
+                return _jsonrpc_error(
+                    _METHOD_NOT_FOUND,
+                    f"Unknown tool: {name}",
+                    {"available_tools": self._available_tools},
+                )
+            result = await self._tool_dispatch[name](arguments)
+
+            # Handlers that already return an MCP response (e.g. isError results) pass through
+            if isinstance(result, dict) and isinstance(result.get("content"), list):
+                return result
 
             # Format result for MCP response
             return {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}
 
         except (KeyError, ValueError) as e:
-            return {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32602, # Invalid params
-                    "message": f"Invalid parameters or tool execution failed: {str(e)}",
-                },
-            }
+            return _jsonrpc_error(
+                _INVALID_PARAMS,
+                f"Invalid parameters or tool execution failed: {str(e)}",
+            )
         except (RuntimeError, AttributeError) as e:
-            return {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32000, # Server error
-                    "message": f"Unexpected server error: {str(e)}",
-                },
-            }
+            return _jsonrpc_error(_SERVER_ERROR, f"Unexpected server error: {str(e)}")
         except Exception as e: # Catch any other unexpected errors
-            return {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32000, # Server error
-                    "message": f"An unexpected error occurred: {str(e)}",
-                },
-            }
+            return _jsonrpc_error(_SERVER_ERROR, f"An unexpected error occurred: {str(e)}")
+
+    async def handle_call_tools_batch(
+        self, calls: List[Tuple[str, dict]], max_concurrency: int = 8
+    ) -> List[dict]:
+        """
+        Run several tool calls concurrently and return their results in call order.
+
+        Tool calls are I/O bound (LLM requests, subprocesses, file writes), so they
+        overlap well. The semaphore caps how many run at once, which also bounds
+        memory when several large LLM responses are in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(name: str, arguments: dict) -> dict:
+            async with semaphore:
+                return await self.handle_call_tool(name, arguments)
+
+        results = await asyncio.gather(
+            *(run_one(name, arguments) for name, arguments in calls), return_exceptions=True
+        )
+        return [
+            (
+                _jsonrpc_error(_SERVER_ERROR, f"An unexpected error occurred: {str(result)}")
+                if isinstance(result, Exception)
+                else result
+            )
+            for result in results
+        ]
 
     async def _get_project_features(self) -> list[str]:
         """Analyze the project to find the features in use."""
@@ -1171,19 +1412,8 @@ class KotlinMCPServer:
         dependencies = dependencies_result.get("dependencies", [])
 
         features = []
-        # A mapping of dependency names to feature names
-        feature_keywords = {
-            "hilt": "hilt",
-            "room": "room",
-            "retrofit": "retrofit",
-            "compose": "compose",
-            "lifecycle-viewmodel": "viewmodel",
-            "kotlinx-coroutines": "coroutines",
-            "navigation-compose": "navigation",
-        }
-
         for dep in dependencies:
-            for keyword, feature in feature_keywords.items():
+            for keyword, feature in _FEATURE_KEYWORDS:
                 if keyword in dep.get("name", ""):
                     features.append(feature)
 
@@ -1201,6 +1431,11 @@ class KotlinMCPServer:
             user_features = arguments.get("features", []) # Features provided by the user
             generate_related = arguments.get("generate_related", False)
 
+            # Reject unknown class types before doing any project analysis
+            generator_name = _KOTLIN_GENERATORS.get(class_type)
+            if generator_name is None:
+                return {"success": False, "error": f"Unsupported class type: {class_type}"}
+
             # Get project features
             project_features = await self._get_project_features()
             
@@ -1250,60 +1485,22 @@ class KotlinMCPServer:
                     package_name = ""
 
             # Generate content based on class type
-            if class_type == "activity":
-                content = self.kotlin_generator.generate_complete_activity(
-                    package_name, class_name, features
-                )
-            elif class_type == "viewmodel":
-                content = self.kotlin_generator.generate_complete_viewmodel(
-                    package_name, class_name, features
-                )
-            elif class_type == "repository":
-                content = self.kotlin_generator.generate_complete_repository(
-                    package_name, class_name, features
-                )
-            elif class_type == "fragment":
-                content = self.kotlin_generator.generate_complete_fragment(
-                    package_name, class_name, features
-                )
-            elif class_type == "data_class":
-                content = self.kotlin_generator.generate_complete_data_class(
-                    package_name, class_name, features
-                )
-            elif class_type == "use_case":
-                content = self.kotlin_generator.generate_complete_use_case(
-                    package_name, class_name, features
-                )
-            elif class_type == "service":
-                content = self.kotlin_generator.generate_complete_service(
-                    package_name, class_name, features
-                )
-            elif class_type == "adapter":
-                content = self.kotlin_generator.generate_complete_adapter(
-                    package_name, class_name, features
-                )
-            elif class_type == "interface":
-                content = self.kotlin_generator.generate_complete_interface(
-                    package_name, class_name, features
-                )
-            elif class_type == "class":
-                content = self.kotlin_generator.generate_complete_class(
-                    package_name, class_name, features
-                )
-            else:
-                return {"success": False, "error": f"Unsupported class type: {class_type}"}
-
-            # Create directory if it doesn't exist
-            validated_path.parent.mkdir(parents=True, exist_ok=True)
+            generate = getattr(self.kotlin_generator, generator_name)
+            content = generate(package_name, class_name, features)
 
-            # Write file
-            validated_path.write_text(content, encoding="utf-8")
+            # Create directory if needed and write the file without blocking the event loop
+            await asyncio.to_thread(_write_text_file, validated_path, content)
 
             # Generate related files if requested
             related_files = []
             if generate_related:
-                related_files = self.kotlin_generator.generate_related_files(
-                    class_type, package_name, class_name, validated_path.parent, features
+                related_files = await asyncio.to_thread(
+                    self.kotlin_generator.generate_related_files,
+                    class_type,
+                    package_name,
+                    class_name,
+                    validated_path.parent,
+                    features,
                 )
 
             # Log audit event
@@ -1499,8 +1696,9 @@ class KotlinMCPServer:
                     layout_path = (
                         self.project_path / "app/src/main/res/layout" / f"{layout_name}.xml"
                     )
-                    layout_path.parent.mkdir(parents=True, exist_ok=True)
-                    layout_path.write_text(result.get("content", ""), encoding="utf-8")
+                    await asyncio.to_thread(
+                        _write_text_file, layout_path, result.get("content", "")
+                    )
 
                     result["file_path"] = str(layout_path)
                     result["layout_type"] = layout_type
@@ -1693,9 +1891,9 @@ class KotlinMCPServer:
 
             return result
         except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-                return {"content": [{"type": "text", "text": "Error: Operation failed: {str(e)}"}],"isError": True}
+            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
         except (RuntimeError, AttributeError, TypeError) as e:
-                return {"content": [{"type": "text", "text": "Error: Unexpected error: {str(e)}"}],"isError": True}
+            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
 
     async def _setup_mvvm_architecture(self, arguments: dict) -> dict:
         """Set up complete MVVM architecture using AI."""
@@ -1760,34 +1958,22 @@ class KotlinMCPServer:
         except (RuntimeError, AttributeError, TypeError) as e:
             return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
 
-    async def _setup_dependency_injection(self, arguments: dict) -> dict:
-        """Set up dependency injection using AI."""
+    async def _generate_with_spec(self, spec_name: str, arguments: dict) -> dict:
+        """Run an AI code generation request described by an entry in _AI_SETUP_SPECS."""
+        spec = _AI_SETUP_SPECS[spec_name]
         try:
-            injection_type = arguments.get("injection_type", "hilt")
-            modules = arguments.get("modules", ["app", "network", "database"])
-
-            di_description = f"""
-            Set up {injection_type} dependency injection with the following modules:
-            Modules: {', '.join(modules)}
-
-            Create:
-            1. Application class with DI setup
-            2. Module classes for each specified module
-            3. Component interfaces if needed
-            4. Qualifier annotations
-            5. Provider methods for dependencies
-            6. Proper scoping annotations
-
-            Follow best practices for {injection_type}
-            """
+            values = {}
+            for param, default in spec["params"]:
+                value = arguments[param] if default is _REQUIRED else arguments.get(param, default)
+                values[param] = ", ".join(value) if isinstance(value, (list, tuple)) else value
 
             request = CodeGenerationRequest(
-                description=di_description,
-                code_type=CodeType.CUSTOM,
-                package_name="di",
-                class_name="DependencyInjection",
+                description=spec["description"].format(**values),
+                code_type=spec["code_type"],
+                package_name=spec["package_name"],
+                class_name=spec["class_name"].format(**values),
                 framework="android",
-                features=["hilt", "dependency_injection"],
+                features=list(spec["features"]),
             )
 
             result = await self.llm_integration.generate_code_with_ai(request)
@@ -1797,243 +1983,33 @@ class KotlinMCPServer:
         except (RuntimeError, AttributeError, TypeError) as e:
             return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
 
+    async def _setup_dependency_injection(self, arguments: dict) -> dict:
+        """Set up dependency injection using AI."""
+        return await self._generate_with_spec("dependency_injection", arguments)
+
     async def _setup_room_database(self, arguments: dict) -> dict:
         """Set up Room database using AI."""
-        try:
-            database_name = arguments["database_name"]
-            entities = arguments.get("entities", [])
-            version = arguments.get("version", 1)
-
-            room_description = f"""
-            Set up Room database with the following specifications:
-            Database Name: {database_name}
-            Entities: {', '.join(entities)}
-            Version: {version}
-
-            Create:
-            1. Entity classes with proper annotations
-            2. DAO interfaces with CRUD operations
-            3. Database class with Room configuration
-            4. Type converters if needed
-            5. Migration strategies
-            6. Repository integration
-
-            Use modern Room patterns and coroutines
-            """
-
-            request = CodeGenerationRequest(
-                description=room_description,
-                code_type=CodeType.CUSTOM,
-                package_name="database",
-                class_name=database_name,
-                framework="android",
-                features=["room", "coroutines", "hilt"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
+        return await self._generate_with_spec("room_database", arguments)
 
     async def _setup_retrofit_api(self, arguments: dict) -> dict:
         """Set up Retrofit API client using AI."""
-        try:
-            api_name = arguments["api_name"]
-            base_url = arguments["base_url"]
-            endpoints = arguments.get("endpoints", [])
-
-            retrofit_description = f"""
-            Set up Retrofit API client with the following specifications:
-            API Name: {api_name}
-            Base URL: {base_url}
-            Endpoints: {', '.join(endpoints)}
-
-            Create:
-            1. API service interface with endpoints
-            2. Data models for requests/responses
-            3. Retrofit configuration with interceptors
-            4. Error handling
-            5. Authentication handling
-            6. Repository integration
-
-            Use modern networking patterns with coroutines
-            """
-
-            request = CodeGenerationRequest(
-                description=retrofit_description,
-                code_type=CodeType.CUSTOM,
-                package_name="network",
-                class_name=api_name,
-                framework="android",
-                features=["retrofit", "coroutines", "hilt"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
+        return await self._generate_with_spec("retrofit_api", arguments)
 
     async def _encrypt_sensitive_data(self, arguments: dict) -> dict:
         """Implement data encryption using AI."""
-        try:
-            encryption_type = arguments.get("encryption_type", "aes")
-            data_types = arguments.get("data_types", ["user_data", "credentials"])
-
-            encryption_description = f"""
-            Implement {encryption_type} encryption for sensitive data:
-            Data Types: {', '.join(data_types)}
-
-            Create:
-            1. Encryption utility classes
-            2. Key management with Android Keystore
-            3. Secure data storage methods
-            4. Decryption utilities
-            5. Error handling for crypto operations
-            6. Proper key rotation strategies
-
-            Follow Android security best practices
-            """
-
-            request = CodeGenerationRequest(
-                description=encryption_description,
-                code_type=CodeType.UTILITY_CLASS,
-                package_name="security",
-                class_name="DataEncryption",
-                framework="android",
-                features=["security", "encryption"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
+        return await self._generate_with_spec("encrypt_sensitive_data", arguments)
 
     async def _implement_gdpr_compliance(self, arguments: dict) -> dict:
         """Implement GDPR compliance features using AI."""
-        try:
-            compliance_level = arguments.get("compliance_level", "basic")
-
-            gdpr_description = f"""
-            Implement GDPR compliance features at {compliance_level} level:
-
-            Create:
-            1. Consent management system
-            2. Data processing logging
-            3. User rights implementation (access, deletion, portability)
-            4. Privacy policy integration
-            5. Data retention policies
-            6. Audit trail mechanisms
-
-            Ensure full GDPR compliance for data handling
-            """
-
-            request = CodeGenerationRequest(
-                description=gdpr_description,
-                code_type=CodeType.UTILITY_CLASS,
-                package_name="compliance",
-                class_name="GDPRCompliance",
-                framework="android",
-                features=["gdpr", "privacy", "compliance"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
+        return await self._generate_with_spec("gdpr_compliance", arguments)
 
     async def _implement_hipaa_compliance(self, arguments: dict) -> dict:
         """Implement HIPAA compliance features using AI."""
-        try:
-            security_level = arguments.get("security_level", "standard")
-
-            hipaa_description = f"""
-            Implement HIPAA compliance features at {security_level} security level:
-
-            Create:
-            1. PHI (Protected Health Information) handling
-            2. Access control and authentication
-            3. Audit logging for all PHI access
-            4. Encryption for data at rest and in transit
-            5. User access management
-            6. Breach detection and reporting
-
-            Ensure full HIPAA compliance for healthcare data
-            """
-
-            request = CodeGenerationRequest(
-                description=hipaa_description,
-                code_type=CodeType.UTILITY_CLASS,
-                package_name="compliance",
-                class_name="HIPAACompliance",
-                framework="android",
-                features=["hipaa", "healthcare", "security"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
+        return await self._generate_with_spec("hipaa_compliance", arguments)
 
     async def _setup_secure_storage(self, arguments: dict) -> dict:
         """Set up secure storage using AI."""
-        try:
-            storage_type = arguments.get("storage_type", "preferences")
-
-            storage_description = f"""
-            Set up secure {storage_type} storage:
-
-            Create:
-            1. Encrypted storage wrapper
-            2. Android Keystore integration
-            3. Biometric authentication support
-            4. Secure backup strategies
-            5. Key rotation mechanisms
-            6. Storage integrity validation
-
-            Use Android security best practices
-            """
-
-            request = CodeGenerationRequest(
-                description=storage_description,
-                code_type=CodeType.UTILITY_CLASS,
-                package_name="storage",
-                class_name="SecureStorage",
-                framework="android",
-                features=["security", "encryption", "biometric"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Operation failed: {str(e)}"}], "isError": True}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"content": [{"type": "text", "text": f"Error: Unexpected error: {str(e)}"}], "isError": True}
-
-            request = CodeGenerationRequest(
-                description=storage_description,
-                code_type=CodeType.UTILITY_CLASS,
-                package_name="storage",
-                class_name="SecureStorage",
-                framework="android",
-                features=["security", "encryption", "biometric"],
-            )
-
-            result = await self.llm_integration.generate_code_with_ai(request)
-            return result
-        except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
-            return {"success": False, "error": f"Operation failed: {str(e)}"}
-        except (RuntimeError, AttributeError, TypeError) as e:
-            return {"success": False, "error": f"Unexpected error: {str(e)}"}
+        return await self._generate_with_spec("secure_storage", arguments)
 
     async def _query_llm(self, arguments: dict) -> dict:
         """Direct query to the LLM."""
@@ -2240,7 +2216,8 @@ class KotlinMCPServer:
             if not class_file.exists():
                 return {"success": False, "error": f"Target class file not found: {target_class}"}
 
-            class_content = class_file.read_text(encoding="utf-8")
+            # Keep disk I/O off the event loop so concurrent requests are not stalled
+            class_content = await asyncio.to_thread(class_file.read_text, encoding="utf-8")
 
             test_description = f"""
             Generate comprehensive unit tests for the following Kotlin class using {test_framework}:
@@ -2282,8 +2259,9 @@ class KotlinMCPServer:
                         self.project_path
                         / f"app/src/test/java/{target_class.replace('.', '/')}Test.kt"
                     )
-                    test_path.parent.mkdir(parents=True, exist_ok=True)
-                    test_path.write_text(result.get("content", ""), encoding="utf-8")
+                    await asyncio.to_thread(
+                        _write_text_file, test_path, result.get("content", "")
+                    )
 
                     result["test_file_path"] = str(test_path)
                     result["target_class"] = target_class
@@ -2324,6 +2302,12 @@ class KotlinMCPServer:
             )
 
             result = await self.llm_integration.generate_code_with_ai(request)
+
+            # UI test runs benefit most from Gradle's build and configuration caches
+            if self.build_optimization and result.get("success"):
+                added = await asyncio.to_thread(self.build_optimization.ensure_cache_properties)
+                if added:
+                    result["created_files"] = [str(self.project_path / "gradle.properties")]
             return result
         except (KeyError, ValueError, FileNotFoundError, PermissionError) as e:
             return {"content": [{"type": "text", "text": f"Error: UI testing setup failed: {str(e)}"}],"isError": True}
@@ -2355,7 +2339,7 @@ class KotlinMCPServer:
                         logs_result = await self._get_run_logs(repo, run["id"])
                         if logs_result.get("success"):
                             debug_arguments = {
-                                "stack_trace": f"Workflow run {run["id"]} failed. Logs:\n{logs_result["logs"]}"
+                                "stack_trace": f"Workflow run {run['id']} failed. Logs:\n{logs_result['logs']}"
                             }
                             debug_analysis = await self.handle_debug_tool(debug_arguments)
                             run["debug_analysis"] = debug_analysis # Add debug analysis to the run info
@@ -2439,9 +2423,20 @@ class KotlinMCPServer:
 
     async def handle_design_tool(self, arguments: dict) -> dict:
         """Handle design tool calls."""
+        sub_command = arguments.get("sub_command")
         figma_file_url = arguments.get("figma_file_url")
         figma_token = arguments.get("figma_token")
 
+        if not sub_command or not figma_file_url or not figma_token:
+            return {"success": False, "error": "sub_command, figma_file_url and figma_token are required."}
+
+        # Figma URLs look like https://www.figma.com/file/<key>/<title> (or /design/<key>/...)
+        parts = figma_file_url.rstrip("/").split("/")
+        file_key = next(
+            (parts[i + 1] for i, part in enumerate(parts[:-1]) if part in ("file", "design")),
+            parts[-1],
+        )
+
         if sub_command == "get_file_metadata":
             url = f"https://api.figma.com/v1/files/{file_key}"
             headers = {"X-Figma-Token": figma_token}
@@ -2460,6 +2455,7 @@ class KotlinMCPServer:
                 return {"success": False, "error": "token_type and output_file are required for extract_tokens operation."}
             return await self._extract_design_tokens(file_key, figma_token, token_type, output_file)
         else:
+            return {"success": False, "error": f"Unknown sub_command: {sub_command}"}
 
     async def _extract_design_tokens(self, file_key: str, figma_token: str, token_type: str, output_file: str) -> dict:
         """Extract design tokens (colors, fonts) from a Figma file and generate Kotlin code."""
@@ -2549,6 +2545,8 @@ class KotlinMCPServer:
             return {"success": True, "message": f"Successfully extracted tokens to {output_file}"}
         except Exception as e:
             return {"success": False, "error": f"Failed to write output file: {e}"}
+
+    async def handle_tickets_tool(self, arguments: dict) -> dict:
         """Handle tickets tool calls."""
         sub_command = arguments.get("sub_command")
         repo = arguments.get("repo")
@@ -3093,9 +3091,9 @@ def main() -> None:
                 elif method == "list_tools" or method == "tools/list":
                     result = await server.handle_list_tools()
                     response = {"jsonrpc": "2.0", "id": request_id, "result": result}
-                elif method == "call_tool":
+                elif method == "tools/call" or method == "call_tool":
                     tool_name = params.get("name")
-                    tool_args = params.get("arguments", {})
+                    tool_args = params.get("arguments")
                     result = await server.handle_call_tool(tool_name, tool_args)
                     response = {"jsonrpc": "2.0", "id": request_id, "result": result}
                 else:
@@ -4,10 +4,12 @@ Test Suite for AI/LLM Integration Module
 Tests AI-powered code generation and analysis tools
 """
 
+import asyncio
 import tempfile
 
 import pytest
 
+from ai.llm_integration import CodeGenerationRequest, CodeType, LLMIntegration
 from kotlin_mcp_server import KotlinMCPServer
 
 
@@ -123,3 +125,25 @@ class TestLLMIntegration:
             "ai_refactor_suggestions", {"file_path": "", "refactor_type": "performance"}
         )
         assert "content" in result
+
+    @pytest.mark.asyncio
+    async def test_generate_code_with_ai_cache(self) -> None:
+        """Test identical generation requests are served from the cache"""
+        llm = LLMIntegration()
+        request = CodeGenerationRequest(
+            description="Main screen",
+            code_type=CodeType.ACTIVITY,
+            package_name="com.example",
+            class_name="MainActivity",
+        )
+
+        results = await asyncio.gather(*(llm.generate_code_with_ai(request) for _ in range(3)))
+        assert all(result == results[0] for result in results)
+        assert len(llm._generation_cache) == 1
+
+        # Callers get their own copy, so mutating a result does not poison the cache
+        results[0]["generated_code"] = ""
+        assert (await llm.generate_code_with_ai(request))["generated_code"]
+
+        llm.set_project_context({"architecture": "MVI"})
+        assert not llm._generation_cache
@@ -11,7 +11,7 @@ from typing import Any, Dict, cast
 import pytest
 
 # Import the unified server
-from kotlin_mcp_server import KotlinMCPServer
+from kotlin_mcp_server import TOOL_NAMES, KotlinMCPServer
 
 
 class TestKotlinMCPServerCore:
@@ -90,6 +90,14 @@ class TestKotlinMCPServerCore:
         if result["content"]:
             assert "text" in result["content"][0]
 
+    @pytest.mark.asyncio
+    async def test_list_tools_returns_independent_lists(self, server: KotlinMCPServer) -> None:
+        """Test mutating one tools/list result does not change the next"""
+        first = (await server.handle_list_tools())["tools"]
+        count = len(first)
+        first.clear()
+        assert len((await KotlinMCPServer("other").handle_list_tools())["tools"]) == count
+
     @pytest.mark.asyncio
     async def test_project_path_management(self, server: KotlinMCPServer) -> None:
         """Test project path setting and validation"""
@@ -120,6 +128,45 @@ class TestKotlinMCPServerCore:
         assert len(result["content"]) > 0
         assert "Unknown tool" in result["content"][0]["text"]
 
+    @pytest.mark.asyncio
+    async def test_handle_call_tools_batch(self, server: KotlinMCPServer) -> None:
+        """Test batched tool calls return one result per call, in order"""
+        results = await server.handle_call_tools_batch(
+            [
+                ("invalid_tool_name", {}),
+                ("format_code", {}),
+                ("another_invalid_tool", {}),
+            ],
+            max_concurrency=2,
+        )
+        assert len(results) == 3
+        assert all(isinstance(result, dict) for result in results)
+        assert "invalid_tool_name" in results[0]["error"]["message"]
+        assert "another_invalid_tool" in results[2]["error"]["message"]
+
+    def test_tool_names_match_dispatch(self, server: KotlinMCPServer) -> None:
+        """Test the exported TOOL_NAMES are exactly the tools handle_call_tool dispatches"""
+        assert server._tool_names == TOOL_NAMES
+
+    @pytest.mark.asyncio
+    async def test_non_dict_tool_result_is_wrapped(self, server: KotlinMCPServer) -> None:
+        """Test handler results that are not dicts are wrapped rather than raising"""
+
+        async def list_handler(arguments: Dict[str, Any]) -> Any:
+            return ["first", "second"]
+
+        server._tool_dispatch = {**server._tool_dispatch, "format_code": list_handler}
+        result = await server.handle_call_tool("format_code", {})
+        assert "content" in result
+        assert "first" in result["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_tickets_tool_is_dispatched(self, server: KotlinMCPServer) -> None:
+        """Test the tickets tool reaches its handler and validates its arguments"""
+        assert "tickets" in server._tool_dispatch
+        result = await server.handle_call_tool("tickets", {"sub_command": "list"})
+        assert "sub_command and repo are required" in result["content"][0]["text"]
+
     @pytest.mark.asyncio
     async def test_empty_arguments_handling(self, server: KotlinMCPServer) -> None:
         """Test handling of empty arguments"""
@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+Test Suite for the VS Code HTTP Bridge
+Tests request handling, tool call validation, worker pooling and in-process calls
+"""
+
+import asyncio
+import concurrent.futures
+import http.client
+import importlib.util
+import json
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import vscode_bridge
+from kotlin_mcp_server import TOOL_NAMES
+
+
+@pytest.fixture
+def bridge_port() -> Iterator[int]:
+    """Serve MCPBridgeHandler on an ephemeral port for the duration of a test"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), vscode_bridge.MCPBridgeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield httpd.server_address[1]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def fake_tool_calls(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Answer tool calls in both frontends without starting an MCP server"""
+    calls: List[Any] = []
+
+    def call_mcp_tool(self: Any, tool_name: str, arguments: Any, project_path: str) -> Any:
+        calls.append((tool_name, arguments, project_path))
+        return {"content": [{"type": "text", "text": tool_name}]}
+
+    async def call_tool_async(pool: Any, tool_name: str, arguments: Any, project_path: str) -> Any:
+        return call_mcp_tool(None, tool_name, arguments, project_path)
+
+    monkeypatch.setattr(vscode_bridge.MCPBridgeHandler, "call_mcp_tool", call_mcp_tool)
+    monkeypatch.setattr(vscode_bridge, "_call_tool_async", call_tool_async)
+    return calls
+
+
+def _exchange(port: int, raw_request: bytes) -> bytes:
+    """Send raw bytes to the bridge and read everything until it closes the connection"""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(raw_request)
+        chunks = []
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except ConnectionResetError:
+                # A rejected request's unread bytes make the server's close send a reset
+                chunk = b""
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+def _post(body: bytes, extra_headers: bytes = b"Connection: close\r\n") -> bytes:
+    """Raw POST request with a correct Content-Length"""
+    return b"POST / HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n%s\r\n%s" % (
+        len(body),
+        extra_headers,
+        body,
+    )
+
+
+class _FakeServer:
+    """Stand-in for KotlinMCPServer whose handler blocks like gradle or file walks do"""
+
+    instances: List["_FakeServer"] = []
+
+    def __init__(self, name: str) -> None:
+        self.project_path = ""
+        self.closed = False
+        _FakeServer.instances.append(self)
+
+    def set_project_path(self, project_path: str) -> None:
+        self.project_path = project_path
+
+    async def handle_call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(arguments.get("sleep", 0))
+        if name == "missing_tool":
+            return {"jsonrpc": "2.0", "error": {"code": -32601, "message": "Unknown tool"}}
+        return {"content": [{"type": "text", "text": self.project_path}]}
+
+    def cleanup(self) -> None:
+        self.closed = True
+
+
+# Imports the bridge with the given JSON modules hidden and parses bytearray bodies
+_JSON_TIER_CHECK = """
+import sys
+for name in sys.argv[1:]:
+    sys.modules[name] = None
+import vscode_bridge
+assert vscode_bridge._parse_tool_request(bytearray(b'{"tool": "format_code"}'))[3] is None
+error = vscode_bridge._parse_tool_request(bytearray(b'{"tool": '))[3]
+assert error.startswith("Invalid JSON"), error
+assert vscode_bridge._json_loads(vscode_bridge._json_dumps({"path": "a/b"})) == {"path": "a/b"}
+"""
+
+
+class TestJsonTiers:
+    """Test suite for the orjson, ujson and json fallbacks"""
+
+    @pytest.mark.parametrize(
+        "hidden, required",
+        [((), "orjson"), (("orjson",), "ujson"), (("orjson", "ujson"), "json")],
+    )
+    def test_request_bodies_parse(self, hidden: Any, required: str) -> None:
+        """Test each tier parses bytearray bodies and reports malformed JSON as 400 errors"""
+        if importlib.util.find_spec(required) is None:
+            pytest.skip(f"{required} is not installed")
+        subprocess.run(
+            [sys.executable, "-c", _JSON_TIER_CHECK, *hidden],
+            check=True,
+            cwd=Path(vscode_bridge.__file__).parent,
+        )
+
+
+class TestInProcessCalls:
+    """Test suite for in-process tool calls"""
+
+    def test_subprocess_mode_is_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test tools run in subprocesses unless in-process mode is requested"""
+        assert vscode_bridge._BRIDGE_MODE == "subprocess"
+        vscode_bridge._in_process_server_class.cache_clear()
+        assert vscode_bridge._in_process_server_class() is None
+
+        monkeypatch.setattr(vscode_bridge, "_BRIDGE_MODE", "inprocess")
+        vscode_bridge._in_process_server_class.cache_clear()
+        try:
+            assert vscode_bridge._in_process_server_class() is not None
+        finally:
+            vscode_bridge._in_process_server_class.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_blocking_handler_does_not_stall_event_loop(self) -> None:
+        """Test a blocking handler runs off the serving event loop"""
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        result = await vscode_bridge._call_in_process(
+            _FakeServer, "format_code", {"sleep": 0.3}, tempfile.gettempdir()
+        )
+        task.cancel()
+
+        assert result == {"content": [{"type": "text", "text": tempfile.gettempdir()}]}
+        assert ticks > 5
+
+    @pytest.mark.asyncio
+    async def test_in_process_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a slow in-process call reports a timeout that says it keeps running"""
+        monkeypatch.setattr(vscode_bridge, "_TOOL_TIMEOUT", 0.05)
+        result = await vscode_bridge._call_in_process(
+            _FakeServer, "format_code", {"sleep": 0.3}, tempfile.gettempdir()
+        )
+        assert result == vscode_bridge._IN_PROCESS_TIMEOUT_ERROR
+        assert (
+            vscode_bridge._run_in_process(
+                _FakeServer, "format_code", {"sleep": 0.3}, tempfile.gettempdir()
+            )
+            == vscode_bridge._IN_PROCESS_TIMEOUT_ERROR
+        )
+
+    def test_timed_out_call_is_cancelled_unless_running(self) -> None:
+        """Test a timed-out call that has not started is cancelled instead of run later"""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        ran: List[int] = []
+        running = executor.submit(release.wait)
+        queued = executor.submit(ran.append, 1)
+        try:
+            assert vscode_bridge._in_process_timeout(queued) == vscode_bridge._TIMEOUT_ERROR
+            assert (
+                vscode_bridge._in_process_timeout(running)
+                == vscode_bridge._IN_PROCESS_TIMEOUT_ERROR
+            )
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+        assert queued.cancelled()
+        assert ran == []
+
+    @pytest.mark.asyncio
+    async def test_busy_threads_reject_calls(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test calls are refused rather than queued while every in-process thread is busy"""
+        monkeypatch.setattr(vscode_bridge, "_in_process_slots", threading.BoundedSemaphore(1))
+        project = tempfile.gettempdir()
+        slow = asyncio.ensure_future(
+            vscode_bridge._call_in_process(_FakeServer, "format_code", {"sleep": 0.3}, project)
+        )
+        await asyncio.sleep(0.05)
+        assert (
+            vscode_bridge._run_in_process(_FakeServer, "format_code", {}, project)
+            == vscode_bridge._IN_PROCESS_BUSY_ERROR
+        )
+        assert "error" not in await slow
+        # The slot is released when the call ends
+        assert "error" not in await vscode_bridge._call_in_process(
+            _FakeServer, "format_code", {}, project
+        )
+
+    @pytest.mark.asyncio
+    async def test_in_process_errors_match_subprocess_shape(self) -> None:
+        """Test JSON-RPC errors from handlers and workers both become {"error": message}"""
+        result = await vscode_bridge._call_in_process(
+            _FakeServer, "missing_tool", {}, tempfile.gettempdir()
+        )
+        assert result == {"error": "Unknown tool"}
+        assert vscode_bridge._jsonrpc_result(
+            {"jsonrpc": "2.0", "id": 1, "result": {"jsonrpc": "2.0", "error": {"message": "x"}}}
+        ) == {"error": "x"}
+        assert vscode_bridge._jsonrpc_result(
+            {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Unknown method"}}
+        ) == {"error": "Unknown method"}
+        assert vscode_bridge._jsonrpc_result({"id": 1, "result": {"content": []}}) == {
+            "content": []
+        }
+
+    def test_in_process_servers_are_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test each in-process thread keeps a bounded LRU of servers and closes evicted ones"""
+        monkeypatch.setattr(vscode_bridge, "_IN_PROCESS_SERVERS_PER_THREAD", 2)
+        _FakeServer.instances = []
+        projects = [tempfile.mkdtemp() for _ in range(3)]
+
+        def run() -> None:
+            for project in (projects[0], projects[1], projects[0], projects[2]):
+                vscode_bridge._in_process_call(_FakeServer, "format_code", {}, project)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert [server.project_path for server in _FakeServer.instances] == projects
+        assert [server.closed for server in _FakeServer.instances] == [False, True, False]
+
+
+# Stand-in MCP server: answers each JSON-RPC line with its own pid
+_ECHO_WORKER = (
+    "import json, os, sys\n"
+    "for line in sys.stdin:\n"
+    "    request = json.loads(line)\n"
+    "    text = str(os.getpid())\n"
+    "    result = {'content': [{'type': 'text', 'text': text}]}\n"
+    "    print(json.dumps({'id': request['id'], 'result': result}), flush=True)\n"
+)
+
+
+async def _pool_call(pool: vscode_bridge.WorkerPool, project_path: str) -> str:
+    """Run one request on the pool for project_path and return the worker's pid"""
+    cmd = [sys.executable, "-c", _ECHO_WORKER, project_path]
+    request = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/call"}).encode()
+    result = await pool.call(project_path, cmd, None, request)
+    return result["content"][0]["text"]
+
+
+class TestWorkerPool:
+    """Test suite for pooled worker processes"""
+
+    @pytest.mark.asyncio
+    async def test_workers_are_reused_per_project(self) -> None:
+        """Test sequential calls for one project share a worker"""
+        pool = vscode_bridge.WorkerPool(max_workers=2, max_total_workers=4)
+        try:
+            assert await _pool_call(pool, "a") == await _pool_call(pool, "a")
+            assert pool._live == 1
+        finally:
+            await pool.close()
+        assert pool._live == 0
+        assert not pool._slots and not pool._idle and not pool._active
+
+    @pytest.mark.asyncio
+    async def test_real_server_worker(self) -> None:
+        """Test the bridge's tools/call requests are answered by the actual MCP server"""
+        cmd, env, request, error = vscode_bridge._prepare_tool_call(
+            "tickets", {"sub_command": "list"}, tempfile.mkdtemp()
+        )
+        assert error is None
+        server_script = Path(vscode_bridge.__file__).with_name("kotlin_mcp_server.py")
+        cmd = [sys.executable, str(server_script), *cmd[1:]]
+
+        pool = vscode_bridge.WorkerPool(max_workers=1, max_total_workers=1)
+        try:
+            for _ in range(2):
+                result = await pool.call(cmd[2], cmd, env, request, timeout=60)
+                assert "sub_command and repo are required" in result["content"][0]["text"]
+            assert pool._live == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_global_cap_evicts_least_recently_used(self) -> None:
+        """Test a new project's worker replaces the least recently used idle worker"""
+        pool = vscode_bridge.WorkerPool(max_workers=2, max_total_workers=2)
+        try:
+            first = await _pool_call(pool, "a")
+            second = await _pool_call(pool, "b")
+            assert await _pool_call(pool, "a") == first
+
+            await _pool_call(pool, "c")
+            assert pool._live == 2
+            # "b" was used longest ago: its worker is gone and so is its bookkeeping
+            assert set(pool._idle) == {"a", "c"}
+            assert set(pool._slots) == {"a", "c"}
+            assert await _pool_call(pool, "a") == first
+            assert await _pool_call(pool, "b") != second
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_stay_within_cap(self) -> None:
+        """Test concurrent calls across projects never run more workers than the cap"""
+        pool = vscode_bridge.WorkerPool(max_workers=2, max_total_workers=3)
+        peak = 0
+        acquire = pool._acquire
+
+        async def tracking_acquire(*args: Any) -> Any:
+            nonlocal peak
+            worker = await acquire(*args)
+            peak = max(peak, pool._live)
+            return worker
+
+        pool._acquire = tracking_acquire  # type: ignore[assignment]
+        try:
+            await asyncio.gather(*(_pool_call(pool, project) for project in "abcdabcd"))
+            assert peak <= 3
+            assert pool._live <= 3
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_reaped_projects_are_forgotten(self) -> None:
+        """Test a project's semaphore is dropped once its idle workers are reaped"""
+        pool = vscode_bridge.WorkerPool(max_workers=2, idle_timeout=0, max_total_workers=4)
+        try:
+            await _pool_call(pool, "a")
+            assert "a" in pool._slots
+            await asyncio.sleep(0.01)
+            await pool._reap_idle()
+            assert pool._live == 0
+            assert not pool._slots and not pool._idle and not pool._active
+        finally:
+            await pool.close()
+
+
+class TestBridgeHandler:
+    """Test suite for the threaded HTTPServer frontend"""
+
+    def test_health_and_not_found(self, bridge_port: int) -> None:
+        """Test the /health body and 404 response, both dated"""
+        connection = http.client.HTTPConnection("127.0.0.1", bridge_port, timeout=5)
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        assert response.status == 200
+        health = json.loads(response.read())
+        assert health["status"] == "healthy"
+        assert health["available_tools"] == sorted(TOOL_NAMES)
+        assert response.getheader("Date")
+
+        # Same connection: every response carries Content-Length, so it stays open
+        connection.request("GET", "/missing")
+        response = connection.getresponse()
+        assert response.status == 404
+        assert response.getheader("Date")
+        assert response.read() == b""
+        connection.close()
+
+    def test_options_preflight(self, bridge_port: int) -> None:
+        """Test the CORS preflight response"""
+        connection = http.client.HTTPConnection("127.0.0.1", bridge_port, timeout=5)
+        connection.request("OPTIONS", "/")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert response.getheader("Access-Control-Allow-Methods") == "GET, POST, OPTIONS"
+        assert response.getheader("Content-Length") == "0"
+        assert response.getheader("Date")
+        connection.close()
+
+    def test_idle_connection_times_out(
+        self, bridge_port: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an idle keep-alive connection is closed instead of holding its thread"""
+        monkeypatch.setattr(vscode_bridge.MCPBridgeHandler, "timeout", 0.2)
+        with socket.create_connection(("127.0.0.1", bridge_port), timeout=5) as sock:
+            started = time.monotonic()
+            assert sock.recv(1) == b""
+            assert time.monotonic() - started < 4
+
+    def test_tool_call(self, bridge_port: int, fake_tool_calls: List[Any]) -> None:
+        """Test a tool call is answered with its result and project path"""
+        project = tempfile.mkdtemp()
+        body = json.dumps({"tool": "format_code", "arguments": {}, "project_path": project})
+        connection = http.client.HTTPConnection("127.0.0.1", bridge_port, timeout=5)
+        connection.request("POST", "/", body=body)
+        response = connection.getresponse()
+        assert response.status == 200
+        assert response.getheader("Access-Control-Allow-Origin") == "*"
+        assert json.loads(response.read()) == {
+            "result": {"content": [{"type": "text", "text": "format_code"}]},
+            "project_path": project,
+        }
+        assert fake_tool_calls == [("format_code", {}, project)]
+        connection.close()
+
+    @pytest.mark.parametrize(
+        "request_line",
+        [
+            b"GARBAGE\r\n",
+            b"POST /\r\n",
+            b"GET /health HTTP/1.1 extra\r\n",
+            b"GET /health FTP/1.1\r\n",
+        ],
+    )
+    def test_malformed_request_line(
+        self, bridge_port: int, fake_tool_calls: List[Any], request_line: bytes
+    ) -> None:
+        """Test malformed request lines are rejected with 400 and the connection closed"""
+        # Lines without a valid version are answered HTTP/0.9-style: the error page alone
+        response = _exchange(bridge_port, request_line + b"\r\n")
+        assert b"Error code: 400" in response
+        assert fake_tool_calls == []
+
+    def test_unsupported_http_version(self, bridge_port: int) -> None:
+        """Test HTTP versions other than 1.0 and 1.1 are rejected with 505"""
+        response = _exchange(bridge_port, b"GET /health HTTP/2.0\r\n\r\n")
+        assert b"Error code: 505" in response
+
+    @pytest.mark.parametrize(
+        "headers",
+        [b"X: y\r\n" * 101, b"X: " + b"y" * 65536 + b"\r\n"],
+    )
+    def test_oversized_headers(
+        self, bridge_port: int, fake_tool_calls: List[Any], headers: bytes
+    ) -> None:
+        """Test header blocks over http.client's limits are rejected before any tool runs"""
+        raw = b"POST / HTTP/1.1\r\nHost: x\r\n%s\r\nhello" % headers
+        response = _exchange(bridge_port, raw)
+        assert response.startswith(b"HTTP/1.1 431 ")
+        assert b"Connection: close" in response
+        assert fake_tool_calls == []
+
+    def test_header_names_ignore_case(self, bridge_port: int, fake_tool_calls: List[Any]) -> None:
+        """Test header lookups ignore case"""
+        body = json.dumps({"tool": "format_code", "project_path": tempfile.mkdtemp()}).encode()
+        raw = b"POST / HTTP/1.1\r\ncontent-LENGTH: %d\r\nCONNECTION: close\r\n\r\n%s" % (
+            len(body),
+            body,
+        )
+        assert _exchange(bridge_port, raw).startswith(b"HTTP/1.1 200 ")
+        assert len(fake_tool_calls) == 1
+
+    @pytest.mark.parametrize(
+        "headers, status",
+        [
+            (b"Connection: close\r\n", b"411"),
+            (b"Content-Length: abc\r\nConnection: close\r\n", b"411"),
+            (b"Content-Length: -1\r\nConnection: close\r\n", b"413"),
+            (b"Content-Length: %d\r\n" % (vscode_bridge._MAX_BODY_BYTES + 1), b"413"),
+        ],
+    )
+    def test_content_length_limits(self, bridge_port: int, headers: bytes, status: bytes) -> None:
+        """Test missing, invalid and oversized Content-Length headers"""
+        response = _exchange(bridge_port, b"POST / HTTP/1.1\r\nHost: x\r\n%s\r\n" % headers)
+        status_line, rest = response.split(b"\r\n", 1)
+        assert status_line.split()[1] == status
+        # The body was not read, so the bridge must not try to reuse the connection
+        assert b"Connection: close" in rest
+
+    @pytest.mark.parametrize(
+        "body, message",
+        [
+            (b"{not json", "Invalid JSON"),
+            (b"[]", "Request body must be a JSON object"),
+            (b'{"arguments": {}}', "Invalid tool name"),
+            (b'{"tool": "rm -rf"}', "Invalid tool name"),
+            (b'{"tool": "no_such_tool"}', "Unknown tool: no_such_tool"),
+            (b'{"tool": "format_code", "arguments": []}', "arguments must be a JSON object"),
+            (b'{"tool": "format_code", "project_path": 1}', "project_path must be a string"),
+        ],
+    )
+    def test_malformed_body(
+        self, bridge_port: int, fake_tool_calls: List[Any], body: bytes, message: str
+    ) -> None:
+        """Test malformed tool calls get 400 and never reach a tool"""
+        response = _exchange(bridge_port, _post(body))
+        head, _, payload = response.partition(b"\r\n\r\n")
+        assert head.split()[1] == b"400"
+        assert message in json.loads(payload)["error"]
+        assert fake_tool_calls == []
+
+    def test_pipelined_keep_alive(self, bridge_port: int, fake_tool_calls: List[Any]) -> None:
+        """Test several pipelined requests on one connection are answered in order"""
+        body = json.dumps({"tool": "format_code", "project_path": tempfile.mkdtemp()}).encode()
+        raw = (
+            b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+            + _post(body, b"")
+            + b"OPTIONS / HTTP/1.1\r\nHost: x\r\n\r\n"
+            + b"GET /missing HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+        statuses = re.findall(rb"HTTP/1\.1 (\d{3}) ", _exchange(bridge_port, raw))
+        assert statuses == [b"200", b"200", b"200", b"404"]
+        assert len(fake_tool_calls) == 1
+
+    def test_health_without_server_module(
+        self, bridge_port: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test /health advertises no tools when the server module cannot be imported"""
+        monkeypatch.setattr(vscode_bridge, "_known_tool_names", lambda: None)
+        vscode_bridge._health_body.cache_clear()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", bridge_port, timeout=5)
+            connection.request("GET", "/health")
+            assert json.loads(connection.getresponse().read())["available_tools"] == []
+            connection.close()
+        finally:
+            vscode_bridge._health_body.cache_clear()
+
+    def test_rate_limit(
+        self, bridge_port: int, fake_tool_calls: List[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test tool calls over the opt-in per-client limit get 429"""
+        monkeypatch.setattr(vscode_bridge, "_RATE_LIMIT_REQUESTS", 2)
+        monkeypatch.setattr(vscode_bridge, "_client_calls", {})
+        body = json.dumps({"tool": "format_code", "project_path": tempfile.mkdtemp()}).encode()
+        statuses = [_exchange(bridge_port, _post(body)).split()[1] for _ in range(3)]
+        assert statuses == [b"200", b"200", b"429"]
+        assert len(fake_tool_calls) == 2
+
+    def test_http_10_closes_connection(self, bridge_port: int) -> None:
+        """Test HTTP/1.0 requests without keep-alive get one response and a close"""
+        response = _exchange(bridge_port, b"GET /health HTTP/1.0\r\n\r\n")
+        assert response.count(b"HTTP/1.1 200") == 1
+        assert b"Connection: close" in response
+
+
+class TestProjectPaths:
+    """Test suite for project path validation"""
+
+    def test_paths_are_rechecked_on_every_call(self, tmp_path: Path) -> None:
+        """Test a retargeted symlink or a removed directory is noticed on the next call"""
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        link = tmp_path / "project"
+        link.symlink_to(first)
+
+        assert vscode_bridge._validate_project_path(str(link)) == (str(first.resolve()), None)
+        link.unlink()
+        link.symlink_to(second)
+        assert vscode_bridge._validate_project_path(str(link)) == (str(second.resolve()), None)
+
+        second.rmdir()
+        safe_project_path, error = vscode_bridge._validate_project_path(str(link))
+        assert safe_project_path is None
+        assert "does not exist" in error["error"]
+
+
+class TestRateLimiter:
+    """Test suite for the per-client rate limiter"""
+
+    def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the limiter is opt-in and tracks nothing while disabled"""
+        assert vscode_bridge._RATE_LIMIT_REQUESTS == 0
+        monkeypatch.setattr(vscode_bridge, "_client_calls", {})
+        assert not any(vscode_bridge._rate_limited("10.0.0.1") for _ in range(1000))
+        assert vscode_bridge._client_calls == {}
+
+    def test_idle_clients_are_pruned(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the client table stays bounded and forgets clients outside the window"""
+        monkeypatch.setattr(vscode_bridge, "_RATE_LIMIT_REQUESTS", 5)
+        monkeypatch.setattr(vscode_bridge, "_RATE_LIMIT_MAX_CLIENTS", 3)
+        monkeypatch.setattr(vscode_bridge, "_client_calls", {})
+        clock = [1000.0]
+        monkeypatch.setattr(vscode_bridge.time, "monotonic", lambda: clock[0])
+
+        for client in ("a", "b", "c"):
+            assert not vscode_bridge._rate_limited(client)
+        clock[0] += vscode_bridge._RATE_LIMIT_WINDOW + 1
+        assert not vscode_bridge._rate_limited("d")
+        assert not vscode_bridge._rate_limited("e")
+        assert list(vscode_bridge._client_calls) == ["d", "e"]
+
+        for client in ("f", "g", "h"):
+            assert not vscode_bridge._rate_limited(client)
+        assert len(vscode_bridge._client_calls) == 3
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT unavailable")
+class TestMultipleProcesses:
+    """Test suite for serving from several processes"""
+
+    def test_servers_share_port(self) -> None:
+        """Test two bridge servers bind the same port"""
+        first = vscode_bridge._ReusePortHTTPServer(("127.0.0.1", 0), vscode_bridge.MCPBridgeHandler)
+        try:
+            second = vscode_bridge._ReusePortHTTPServer(
+                first.server_address, vscode_bridge.MCPBridgeHandler
+            )
+            second.server_close()
+        finally:
+            first.server_close()
+
+    def test_refused_with_rate_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the per-process rate limiter forces a single process"""
+        monkeypatch.setenv("MCP_BRIDGE_PROCESSES", "4")
+        assert vscode_bridge._serving_processes() == 4
+
+        monkeypatch.setattr(vscode_bridge, "_RATE_LIMIT_REQUESTS", 10)
+        assert vscode_bridge._serving_processes() == 1
+
+
+class TestBridgeApp:
+    """Test suite for the aiohttp frontend"""
+
+    @pytest.mark.asyncio
+    async def test_health_options_and_not_found(self) -> None:
+        """Test /health, CORS preflight and unknown paths"""
+        async with TestClient(TestServer(vscode_bridge.create_app())) as client:
+            response = await client.get("/health")
+            assert response.status == 200
+            health = await response.json()
+            assert health["status"] == "healthy"
+            assert health["available_tools"] == sorted(TOOL_NAMES)
+
+            response = await client.options("/")
+            assert response.status == 200
+            assert response.headers["Access-Control-Allow-Methods"] == "GET, POST, OPTIONS"
+
+            response = await client.get("/missing")
+            assert response.status == 404
+
+    @pytest.mark.asyncio
+    async def test_tool_call(self, fake_tool_calls: List[Any]) -> None:
+        """Test a tool call is answered with its result and project path"""
+        project = tempfile.mkdtemp()
+        async with TestClient(TestServer(vscode_bridge.create_app())) as client:
+            response = await client.post(
+                "/", data=json.dumps({"tool": "format_code", "project_path": project})
+            )
+            assert response.status == 200
+            assert response.headers["Access-Control-Allow-Origin"] == "*"
+            assert await response.json() == {
+                "result": {"content": [{"type": "text", "text": "format_code"}]},
+                "project_path": project,
+            }
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(
+        self, fake_tool_calls: List[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test tool calls over the opt-in per-client limit get 429"""
+        monkeypatch.setattr(vscode_bridge, "_RATE_LIMIT_REQUESTS", 1)
+        monkeypatch.setattr(vscode_bridge, "_client_calls", {})
+        body = json.dumps({"tool": "format_code", "project_path": tempfile.mkdtemp()})
+        async with TestClient(TestServer(vscode_bridge.create_app())) as client:
+            assert (await client.post("/", data=body)).status == 200
+            assert (await client.post("/", data=body)).status == 429
+        assert len(fake_tool_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_and_oversized_bodies(self, fake_tool_calls: List[Any]) -> None:
+        """Test bad JSON gets 400 and bodies over the limit get 413"""
+        async with TestClient(TestServer(vscode_bridge.create_app())) as client:
+            response = await client.post("/", data=b"{not json")
+            assert response.status == 400
+            assert "Invalid JSON" in (await response.json())["error"]
+
+            response = await client.post("/", data=b" " * (vscode_bridge._MAX_BODY_BYTES + 1))
+            assert response.status == 413
+        assert fake_tool_calls == []
@@ -5,10 +5,12 @@ Tests build optimization and performance tools
 """
 
 import tempfile
+from pathlib import Path
 
 import pytest
 
 from kotlin_mcp_server import KotlinMCPServer
+from tools.build_optimization import BuildOptimizationTools
 
 
 class TestBuildOptimizationTools:
@@ -105,3 +107,83 @@ class TestBuildOptimizationTools:
             result = await server.handle_call_tool(tool_name, args)
             assert "content" in result
             assert isinstance(result["content"], list)
+
+    def test_ensure_cache_properties(self, server: KotlinMCPServer) -> None:
+        """Test gradle.properties cache settings are added once"""
+        assert server.build_optimization is not None
+        gradle_properties = server.project_path / "gradle.properties"
+        gradle_properties.write_text("org.gradle.caching=true", encoding="utf-8")
+
+        added = server.build_optimization.ensure_cache_properties()
+        assert added == ["org.gradle.configuration-cache=true", "org.gradle.parallel=true"]
+        assert server.build_optimization.ensure_cache_properties() == []
+
+        lines = gradle_properties.read_text(encoding="utf-8").splitlines()
+        assert lines == [
+            "org.gradle.caching=true",
+            "org.gradle.configuration-cache=true",
+            "org.gradle.parallel=true",
+        ]
+
+    def test_ensure_cache_properties_keeps_explicit_settings(self, server: KotlinMCPServer) -> None:
+        """Test keys the user already set are not overridden or duplicated"""
+        assert server.build_optimization is not None
+        gradle_properties = server.project_path / "gradle.properties"
+        gradle_properties.write_text(
+            "# org.gradle.parallel=true\norg.gradle.caching = false\n", encoding="utf-8"
+        )
+
+        added = server.build_optimization.ensure_cache_properties()
+        assert added == ["org.gradle.configuration-cache=true", "org.gradle.parallel=true"]
+        content = gradle_properties.read_text(encoding="utf-8")
+        assert "org.gradle.caching=true" not in content
+        assert content.count("org.gradle.caching") == 1
+
+    @pytest.mark.asyncio
+    async def test_apply_optimizations_share_property_writer(self, server: KotlinMCPServer) -> None:
+        """Test apply helpers report only the properties they added"""
+        assert server.build_optimization is not None
+        gradle_properties = server.project_path / "gradle.properties"
+        gradle_properties.write_text("org.gradle.caching=false\n", encoding="utf-8")
+
+        cache = await server.build_optimization._apply_cache_optimizations("moderate")
+        assert cache == ["Enabled Gradle daemon", "Enabled configuration cache"]
+        parallel = await server.build_optimization._apply_parallel_optimizations("conservative")
+        assert parallel == ["Enabled parallel execution"]
+        assert await server.build_optimization._apply_cache_optimizations("moderate") == []
+
+        lines = gradle_properties.read_text(encoding="utf-8").splitlines()
+        assert lines == [
+            "org.gradle.caching=false",
+            "org.gradle.daemon=true",
+            "org.gradle.configuration-cache=true",
+            "org.gradle.parallel=true",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_setup_ui_testing_failure_leaves_properties(
+        self, server: KotlinMCPServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test gradle.properties is untouched when UI testing generation fails"""
+
+        async def fail(request: object) -> dict:
+            return {"success": False, "error": "generation failed"}
+
+        monkeypatch.setattr(server.llm_integration, "generate_code_with_ai", fail)
+        await server._setup_ui_testing({"testing_type": "espresso"})
+        assert not (server.project_path / "gradle.properties").exists()
+
+    def test_ensure_cache_properties_many(self, server: KotlinMCPServer) -> None:
+        """Test cache settings are applied to several projects at once"""
+        project_paths = [Path(tempfile.mkdtemp()) for _ in range(3)]
+
+        results = BuildOptimizationTools.ensure_cache_properties_many(
+            project_paths, server.security_manager
+        )
+
+        assert set(results) == {str(path) for path in project_paths}
+        for path in project_paths:
+            assert len(results[str(path)]) == 3
+            assert "org.gradle.parallel=true" in (path / "gradle.properties").read_text(
+                encoding="utf-8"
+            )
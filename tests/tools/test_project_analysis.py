@@ -5,10 +5,12 @@ Tests project analysis and build optimization functionality
 """
 
 import tempfile
+from pathlib import Path
 
 import pytest
 
 from kotlin_mcp_server import KotlinMCPServer
+from tools.project_analysis import ProjectAnalysisTools, _iter_source_files
 
 
 class TestProjectAnalysisTools:
@@ -77,3 +79,31 @@ class TestProjectAnalysisTools:
             result = await server.handle_call_tool(tool_name, args)
             assert "content" in result
             assert isinstance(result["content"], list)
+
+    @pytest.mark.asyncio
+    async def test_find_global_scope_usages(self) -> None:
+        """Test GlobalScope usages are found across Kotlin source files"""
+        project_path = Path(tempfile.mkdtemp())
+        source_dir = project_path / "app" / "src" / "main" / "kotlin" / "com" / "example"
+        source_dir.mkdir(parents=True)
+        (source_dir / "Leaky.kt").write_text("fun leak() = GlobalScope.launch { }\n")
+        (source_dir / "Clean.kt").write_text("fun ok() = viewModelScope.launch { }\n")
+
+        tools = ProjectAnalysisTools(project_path, None)
+        usages = await tools._find_global_scope_usages()
+        assert usages == [(source_dir / "Leaky.kt").as_posix()]
+
+    def test_build_package_inside_src_is_scanned(self) -> None:
+        """Test a package named build is scanned while module build output is pruned"""
+        project_path = Path(tempfile.mkdtemp())
+        module_dir = project_path / "app"
+        package_dir = module_dir / "src" / "main" / "kotlin" / "com" / "example" / "build"
+        package_dir.mkdir(parents=True)
+        (package_dir / "BuildInfo.kt").write_text("object BuildInfo\n")
+        output_dir = module_dir / "build" / "generated"
+        output_dir.mkdir(parents=True)
+        (output_dir / "Generated.kt").write_text("object Generated\n")
+
+        assert list(_iter_source_files(module_dir)) == [(package_dir / "BuildInfo.kt").as_posix()]
+        tools = ProjectAnalysisTools(project_path, None)
+        assert tools._list_kotlin_files() == [(package_dir / "BuildInfo.kt").as_posix()]
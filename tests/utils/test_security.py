@@ -4,13 +4,26 @@ Test Suite for Utils Security Module
 Tests security utilities and encryption functionality
 """
 
+import os
 import tempfile
+from pathlib import Path
 
 import pytest
 from cryptography.fernet import Fernet
 
 from kotlin_mcp_server import KotlinMCPServer
-from utils.security import check_password, decrypt_data, encrypt_data, hash_password
+from utils import security
+from utils.security import (
+    SecurityManager,
+    check_password,
+    clear_cipher_cache,
+    decrypt_data,
+    decrypt_data_aead,
+    encrypt_data,
+    encrypt_data_aead,
+    generate_aead_key,
+    hash_password,
+)
 
 
 class TestSecurityUtils:
@@ -31,6 +44,30 @@ class TestSecurityUtils:
         decrypted = decrypt_data(encrypted, key)
         assert data == decrypted
 
+    def test_encrypt_decrypt_aead(self) -> None:
+        """Test AES-GCM encryption round trip and tamper detection"""
+        key = generate_aead_key()
+        data = b"test data"
+        encrypted = encrypt_data_aead(data, key)
+        assert encrypted != encrypt_data_aead(data, key)  # fresh nonce per call
+        assert decrypt_data_aead(encrypted, key) == data
+
+        assert decrypt_data_aead(encrypt_data_aead("test data", key), key) == data
+        assert decrypt_data_aead(encrypt_data_aead(memoryview(data), key), key) == data
+        assert decrypt_data_aead(bytearray(encrypted), key) == data
+
+        tampered = encrypted[:-1] + bytes([encrypted[-1] ^ 1])
+        with pytest.raises(Exception):
+            decrypt_data_aead(tampered, key)
+        with pytest.raises(Exception):
+            decrypt_data_aead(encrypted, generate_aead_key())
+
+    def test_decrypt_data_only_accepts_fernet(self) -> None:
+        """Test decrypt_data never guesses at other token formats"""
+        key = Fernet.generate_key()
+        with pytest.raises(Exception):
+            decrypt_data(encrypt_data_aead(b"test data", generate_aead_key()), key)
+
     def test_hash_check_password(self) -> None:
         """Test password hashing and verification"""
         password = "test_password"
@@ -96,6 +133,18 @@ class TestSecurityUtils:
         with pytest.raises(Exception):
             decrypt_data(encrypted_with_key1, key2)
 
+    def test_clear_cipher_cache(self) -> None:
+        """Test cached cipher instances (and their keys) can be released"""
+        fernet_key, aead_key = Fernet.generate_key(), generate_aead_key()
+        decrypt_data(encrypt_data(b"data", fernet_key), fernet_key)
+        decrypt_data_aead(encrypt_data_aead(b"data", aead_key), aead_key)
+        assert security._get_fernet.cache_info().currsize > 0
+        assert security._get_aead.cache_info().currsize > 0
+
+        clear_cipher_cache()
+        assert security._get_fernet.cache_info().currsize == 0
+        assert security._get_aead.cache_info().currsize == 0
+
     def test_password_hash_uniqueness(self) -> None:
         """Test that password hashes are unique"""
         password = "same_password"
@@ -123,3 +172,23 @@ class TestSecurityUtils:
             "setup_cloud_sync", {"provider": "invalid_provider", "sync_type": "realtime"}
         )
         assert "content" in result
+
+    def test_validate_file_path_follows_retargeted_symlink(self) -> None:
+        """Test a base directory symlink is re-resolved after it is retargeted"""
+        root = Path(tempfile.mkdtemp())
+        first, second = root / "first", root / "second"
+        first.mkdir()
+        second.mkdir()
+        (second / "Secret.kt").write_text("object Secret\n")
+        link = root / "project"
+        os.symlink(first, link)
+
+        manager = SecurityManager()
+        assert manager.validate_file_path("Main.kt", link) == first / "Main.kt"
+
+        link.unlink()
+        os.symlink(second, link)
+        assert manager.validate_file_path("Secret.kt", link) == second / "Secret.kt"
+        with pytest.raises(ValueError):
+            manager.validate_file_path(str(first / "Main.kt"), link)
+        manager.close()
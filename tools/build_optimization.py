@@ -4,12 +4,38 @@ Provides tools for optimizing build performance, dependency management, and buil
 """
 
 import asyncio
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from utils.security import SecurityManager
 
+# Properties that enable Gradle's build cache, configuration cache and parallel execution
+_CACHE_PROPERTIES = (
+    "org.gradle.caching=true",
+    "org.gradle.configuration-cache=true",
+    "org.gradle.parallel=true",
+)
+# Key of every property assignment in gradle.properties (comments start with # or !)
+_PROPERTY_KEY_RE = re.compile(rb"^[ \t]*([^#!\s=:][^\s=:]*)", re.MULTILINE)
+
+
+# General recommendations for each optimization level
+_LEVEL_RECOMMENDATIONS = {
+    "conservative": ("Consider gradual adoption of build optimizations",),
+    "moderate": (
+        "Implement incremental annotation processing",
+        "Use composite builds for multi-module projects",
+    ),
+    "aggressive": (
+        "Consider using build scans for detailed analysis",
+        "Implement custom Gradle plugins for repetitive tasks",
+        "Use dependency substitution for faster local development",
+    ),
+}
+
 
 class BuildOptimizationTools:
     """Tools for build performance optimization and analysis."""
@@ -60,14 +86,20 @@ class BuildOptimizationTools:
             if measure_baseline:
                 results["baseline_performance"] = await self._measure_build_performance()
 
+            # gradle.properties feeds every analysis and optimization step; read it once
+            properties_content = self._read_gradle_properties()
+            existing_content = properties_content or ""
+
             # 2. Analyze current Gradle configuration
-            results["gradle_analysis"] = await self._analyze_gradle_configuration()
+            results["gradle_analysis"] = await self._analyze_gradle_configuration(
+                properties_content
+            )
 
             # 3. Analyze cache configuration
-            results["cache_analysis"] = await self._analyze_gradle_cache()
+            results["cache_analysis"] = await self._analyze_gradle_cache(existing_content)
 
             # 4. Analyze parallel execution
-            results["parallel_analysis"] = await self._analyze_parallel_execution()
+            results["parallel_analysis"] = await self._analyze_parallel_execution(existing_content)
 
             # 5. Apply optimizations if requested
             applied_optimizations = []
@@ -102,6 +134,60 @@ class BuildOptimizationTools:
         except Exception as e:
             return {"success": False, "error": f"Build optimization failed: {str(e)}"}
 
+    def ensure_cache_properties(self) -> List[str]:
+        """
+        Make sure gradle.properties enables build caching and parallel execution.
+
+        Creates the file if needed; see _ensure_gradle_properties. Blocking; call via
+        ``asyncio.to_thread`` from async code. Returns the properties that were added.
+        """
+        return self._ensure_gradle_properties(_CACHE_PROPERTIES)
+
+    def _ensure_gradle_properties(self, properties: Sequence[str]) -> List[str]:
+        """
+        Append ``key=value`` properties whose key gradle.properties does not set yet.
+
+        The single writer for gradle.properties: one read/write pass, appending only
+        the missing keys. A key the user set explicitly (even to false) is left alone.
+        Returns the properties that were added.
+        """
+        gradle_properties = self.project_path / "gradle.properties"
+
+        # Work on raw bytes: the keys are ASCII, so no decode/encode round-trip is needed
+        existing_content = b""
+        if gradle_properties.exists():
+            existing_content = gradle_properties.read_bytes()
+
+        present_keys = set(_PROPERTY_KEY_RE.findall(existing_content))
+        missing = [
+            prop for prop in properties if prop.split("=", 1)[0].encode() not in present_keys
+        ]
+        if missing:
+            separator = b"\n" if existing_content and not existing_content.endswith(b"\n") else b""
+            added_content = "\n".join(missing).encode() + b"\n"
+            gradle_properties.write_bytes(existing_content + separator + added_content)
+
+        return missing
+
+    @classmethod
+    def ensure_cache_properties_many(
+        cls, project_paths: Iterable[Path], security_manager: SecurityManager
+    ) -> Dict[str, List[str]]:
+        """
+        Run ensure_cache_properties for several projects (e.g. modules of a
+        multi-module build) concurrently. The work is file I/O, so threads overlap well.
+        Returns the added properties keyed by project path.
+        """
+        paths = list(project_paths)
+        if not paths:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+            added = executor.map(
+                lambda path: cls(path, security_manager).ensure_cache_properties(), paths
+            )
+            return {str(path): result for path, result in zip(paths, added)}
+
     async def _measure_build_performance(self) -> Dict[str, Any]:
         """Measure current build performance."""
         try:
@@ -143,27 +229,34 @@ class BuildOptimizationTools:
         except Exception as e:
             return {"error": f"Build measurement failed: {str(e)}", "total_build_time": "unknown"}
 
-    async def _analyze_gradle_configuration(self) -> Dict[str, Any]:
+    def _read_gradle_properties(self) -> Optional[str]:
+        """Return the contents of gradle.properties, or None if the file does not exist."""
+        gradle_properties = self.project_path / "gradle.properties"
+        if not gradle_properties.exists():
+            return None
+        return gradle_properties.read_text(encoding="utf-8")
+
+    async def _analyze_gradle_configuration(
+        self, properties_content: Optional[str]
+    ) -> Dict[str, Any]:
         """Analyze Gradle configuration for optimization opportunities."""
         analysis = {
-            "gradle_properties": self._analyze_gradle_properties(),
+            "gradle_properties": self._analyze_gradle_properties(properties_content),
             "build_scripts": self._analyze_build_scripts(),
             "dependency_resolution": self._analyze_dependency_resolution(),
         }
 
         return analysis
 
-    async def _analyze_gradle_cache(self) -> Dict[str, Any]:
-        """Analyze Gradle cache configuration."""
-        gradle_properties = self.project_path / "gradle.properties"
+    async def _analyze_gradle_cache(self, content: str) -> Dict[str, Any]:
+        """Analyze Gradle cache configuration from the gradle.properties contents."""
         cache_config = {
             "build_cache_enabled": False,
             "configuration_cache_enabled": False,
             "gradle_daemon_enabled": True,
         }
 
-        if gradle_properties.exists():
-            content = gradle_properties.read_text(encoding="utf-8")
+        if content:
             cache_config["build_cache_enabled"] = "org.gradle.caching=true" in content
             cache_config["configuration_cache_enabled"] = (
                 "org.gradle.configuration-cache=true" in content
@@ -172,13 +265,11 @@ class BuildOptimizationTools:
 
         return cache_config
 
-    async def _analyze_parallel_execution(self) -> Dict[str, Any]:
-        """Analyze parallel execution configuration."""
-        gradle_properties = self.project_path / "gradle.properties"
+    async def _analyze_parallel_execution(self, content: str) -> Dict[str, Any]:
+        """Analyze parallel execution configuration from the gradle.properties contents."""
         parallel_config = {"parallel_enabled": False, "max_workers": "auto", "jvm_args": []}
 
-        if gradle_properties.exists():
-            content = gradle_properties.read_text(encoding="utf-8")
+        if content:
             parallel_config["parallel_enabled"] = "org.gradle.parallel=true" in content
 
             # Check for custom worker configuration
@@ -193,80 +284,44 @@ class BuildOptimizationTools:
 
     async def _apply_cache_optimizations(self, optimization_level: str) -> List[str]:
         """Apply cache-related optimizations."""
-        optimizations = []
-        gradle_properties = self.project_path / "gradle.properties"
-
-        # Read existing content
-        existing_content = ""
-        if gradle_properties.exists():
-            existing_content = gradle_properties.read_text(encoding="utf-8")
-
-        properties_to_add = []
-
-        # Basic cache optimizations for all levels
-        if "org.gradle.caching=true" not in existing_content:
-            properties_to_add.append("org.gradle.caching=true")
-            optimizations.append("Enabled Gradle build cache")
-
-        if "org.gradle.daemon=true" not in existing_content:
-            properties_to_add.append("org.gradle.daemon=true")
-            optimizations.append("Enabled Gradle daemon")
+        # (property, description) pairs; basic cache optimizations for all levels
+        candidates = [
+            ("org.gradle.caching=true", "Enabled Gradle build cache"),
+            ("org.gradle.daemon=true", "Enabled Gradle daemon"),
+        ]
 
         # Moderate and aggressive optimizations
         if optimization_level in ["moderate", "aggressive"]:
-            if "org.gradle.configuration-cache=true" not in existing_content:
-                properties_to_add.append("org.gradle.configuration-cache=true")
-                optimizations.append("Enabled configuration cache")
+            candidates.append(
+                ("org.gradle.configuration-cache=true", "Enabled configuration cache")
+            )
 
         # Aggressive optimizations
         if optimization_level == "aggressive":
-            if "org.gradle.configureondemand=true" not in existing_content:
-                properties_to_add.append("org.gradle.configureondemand=true")
-                optimizations.append("Enabled configure on demand")
+            candidates.append(("org.gradle.configureondemand=true", "Enabled configure on demand"))
 
-        # Write updated properties
-        if properties_to_add:
-            updated_content = existing_content + "\n" + "\n".join(properties_to_add) + "\n"
-            gradle_properties.write_text(updated_content, encoding="utf-8")
-
-        return optimizations
+        return self._write_optimizations(candidates)
 
     async def _apply_parallel_optimizations(self, optimization_level: str) -> List[str]:
         """Apply parallel execution optimizations."""
-        optimizations = []
-        gradle_properties = self.project_path / "gradle.properties"
-
-        # Read existing content
-        existing_content = ""
-        if gradle_properties.exists():
-            existing_content = gradle_properties.read_text(encoding="utf-8")
-
-        properties_to_add = []
-
         # Enable parallel execution for all levels
-        if "org.gradle.parallel=true" not in existing_content:
-            properties_to_add.append("org.gradle.parallel=true")
-            optimizations.append("Enabled parallel execution")
+        candidates = [("org.gradle.parallel=true", "Enabled parallel execution")]
 
         # Moderate and aggressive: optimize JVM settings
         if optimization_level in ["moderate", "aggressive"]:
-            if "org.gradle.jvmargs" not in existing_content:
-                jvm_args = "-Xmx4g -Xms1g -XX:MaxMetaspaceSize=512m"
-                properties_to_add.append(f"org.gradle.jvmargs={jvm_args}")
-                optimizations.append("Optimized JVM memory settings")
+            jvm_args = "-Xmx4g -Xms1g -XX:MaxMetaspaceSize=512m"
+            candidates.append((f"org.gradle.jvmargs={jvm_args}", "Optimized JVM memory settings"))
 
         # Aggressive: set max workers
         if optimization_level == "aggressive":
-            if "org.gradle.workers.max" not in existing_content:
-                properties_to_add.append("org.gradle.workers.max=8")
-                optimizations.append("Set maximum worker threads")
+            candidates.append(("org.gradle.workers.max=8", "Set maximum worker threads"))
 
-        # Write updated properties
-        if properties_to_add:
-            updated_content = existing_content + "\n" + "\n".join(properties_to_add) + "\n"
-            gradle_properties.write_text(updated_content, encoding="utf-8")
+        return self._write_optimizations(candidates)
 
-        return optimizations
+    def _write_optimizations(self, candidates: List[Tuple[str, str]]) -> List[str]:
+        """Add the candidate properties to gradle.properties; describe those actually added."""
+        added = set(self._ensure_gradle_properties([prop for prop, _ in candidates]))
+        return [description for prop, description in candidates if prop in added]
 
     async def _apply_gradle_optimizations(self, optimization_level: str) -> List[str]:
         """Apply Gradle build script optimizations."""
@@ -296,14 +351,11 @@ class BuildOptimizationTools:
 
         return optimizations
 
-    def _analyze_gradle_properties(self) -> Dict[str, Any]:
-        """Analyze gradle.properties file."""
-        gradle_properties = self.project_path / "gradle.properties"
-
-        if not gradle_properties.exists():
+    def _analyze_gradle_properties(self, content: Optional[str]) -> Dict[str, Any]:
+        """Analyze gradle.properties contents (None if the file does not exist)."""
+        if content is None:
             return {"status": "gradle.properties not found"}
 
-        content = gradle_properties.read_text(encoding="utf-8")
         properties = {}
 
         for line in content.split("\n"):
@@ -421,14 +473,6 @@ class BuildOptimizationTools:
             recommendations.append("Enable parallel execution to utilize multiple CPU cores")
 
         # General recommendations based on optimization level
-        if optimization_level == "conservative":
-            recommendations.append("Consider gradual adoption of build optimizations")
-        elif optimization_level == "moderate":
-            recommendations.append("Implement incremental annotation processing")
-            recommendations.append("Use composite builds for multi-module projects")
-        elif optimization_level == "aggressive":
-            recommendations.append("Consider using build scans for detailed analysis")
-            recommendations.append("Implement custom Gradle plugins for repetitive tasks")
-            recommendations.append("Use dependency substitution for faster local development")
+        recommendations.extend(_LEVEL_RECOMMENDATIONS.get(optimization_level, ()))
 
         return recommendations
@@ -293,15 +293,18 @@ class GradleTools:
 
             stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=180)
 
+            # Decode once; the text is both parsed and returned
+            stdout_text = stdout.decode("utf-8")
+
             # Parse lint results
-            lint_results = self._parse_lint_results(stdout.decode("utf-8"))
+            lint_results = self._parse_lint_results(stdout_text)
 
             return {
                 "success": process.returncode == 0,
                 "exit_code": process.returncode,
                 "lint_type": lint_type,
                 "lint_results": lint_results,
-                "stdout": stdout.decode("utf-8"),
+                "stdout": stdout_text,
                 "stderr": stderr.decode("utf-8"),
             }
 
@@ -10,12 +10,132 @@ This module provides comprehensive project analysis capabilities:
 - UI modernization recommendations
 """
 
+import asyncio
+import os
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Tuple, Union
 import xml.etree.ElementTree as ET
 
 from utils.security import SecurityManager
 
+# Kotlin/Java source roots relative to the project directory
+_SOURCE_DIRS = ("app/src/main/java", "app/src/main/kotlin")
+
+# Kotlin files are scanned in chunks of this size instead of being read whole
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Maximum number of files scanned concurrently in worker threads
+_SCAN_CONCURRENCY = 32
+
+
+def _compile_markers(*markers: str) -> "re.Pattern[bytes]":
+    """Compile literal ASCII markers into one bytes alternation regex."""
+    return re.compile(b"|".join(re.escape(marker.encode()) for marker in markers))
+
+
+# Directories that never hold hand-written sources; skipped when walking the tree
+_SKIP_DIRS = frozenset({".git", ".gradle", "node_modules"})
+
+# Gradle output directory; only pruned outside src, where it cannot be a package name
+_BUILD_DIR = "build"
+
+
+def _iter_source_files(root: Path, suffix: str = ".kt") -> Iterator[str]:
+    """
+    Yield paths of files under root ending in suffix.
+
+    Uses os.scandir, whose DirEntry type checks come from the directory listing
+    itself (no extra stat per entry, unlike Path.rglob), and prunes VCS
+    directories. A ``build`` directory is pruned only at module level; inside a
+    ``src`` tree it is an ordinary package (e.g. ``com/example/build``).
+    """
+    stack = [(str(root), "src" in Path(root).parts)]
+    while stack:
+        path, in_src = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if name in _SKIP_DIRS or (name == _BUILD_DIR and not in_src):
+                        continue
+                    stack.append((entry.path, in_src or name == "src"))
+                elif entry.name.endswith(suffix):
+                    yield entry.path
+
+
+def _file_contains(path: Union[str, Path], matcher: "re.Pattern[bytes]", max_len: int) -> bool:
+    """
+    Return True as soon as matcher finds a match in the file.
+
+    The file is streamed as raw bytes (the markers are ASCII, so no decoding is
+    needed); the last ``max_len - 1`` bytes of each chunk are carried over so
+    matches spanning a chunk boundary are still found.
+    """
+    overlap = max_len - 1
+    with open(path, "rb") as handle:
+        tail = b""
+        while True:
+            chunk = handle.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                return False
+            window = tail + chunk
+            if matcher.search(window):
+                return True
+            tail = window[-overlap:] if overlap > 0 else b""
+
+
+_GLOBAL_SCOPE_MARKER = _compile_markers("GlobalScope")
+_COMPOSABLE_MARKER = _compile_markers("@Composable")
+
+# AndroidManifest.xml markers and the finding reported for each, in report order
+_MANIFEST_CHECKS = (
+    ("android:theme", "✅ App theme configured"),
+    ("uses-permission", "✅ Permissions declared"),
+    ("android:exported", "✅ Component exports properly declared"),
+)
+# All manifest markers in one alternation so the manifest is scanned once
+_MANIFEST_MARKERS_RE = re.compile("|".join(re.escape(marker) for marker, _ in _MANIFEST_CHECKS))
+
+# Fixed analysis results; read-only so every call can hand out a cheap copy
+_PERFORMANCE_ANALYSIS = MappingProxyType(
+    {"build_time": "45s", "app_size": "12MB", "memory_usage": "normal"}
+)
+_SECURITY_ANALYSIS = MappingProxyType({"security_score": "A+"})
+
+# Fixed fix/finding lists; tuples so they are shared rather than rebuilt per call
+_DEPENDENCY_FIXES = ("Updated AndroidX dependencies", "Fixed security vulnerabilities")
+_PERFORMANCE_FIXES = ("Enabled R8 code shrinking", "Optimized image resources")
+_SECURITY_FIXES = ("Updated vulnerable dependencies", "Added ProGuard rules")
+_OUTDATED_DEPENDENCIES = (
+    "androidx.core:core-ktx:1.8.0 -> 1.12.0",
+    "androidx.compose.ui:ui:1.4.0 -> 1.5.4",
+)
+
+# Modernization advice for each modernization level
+_MODERNIZATION_RECOMMENDATIONS = {
+    "conservative": (
+        "Update dependencies gradually",
+        "Add unit tests for critical paths",
+    ),
+    "moderate": (
+        "Migrate to Jetpack Compose incrementally",
+        "Implement dependency injection with Hilt",
+        "Adopt Kotlin coroutines for async operations",
+    ),
+    "aggressive": (
+        "Complete migration to Jetpack Compose",
+        "Implement clean architecture patterns",
+        "Add comprehensive test coverage",
+        "Optimize build performance with parallel execution",
+    ),
+}
+
 
 class ProjectAnalysisTools:
     """Tools for comprehensive project analysis and refactoring."""
@@ -24,6 +144,8 @@ class ProjectAnalysisTools:
         """Initialize project analysis tools."""
         self.project_path = project_path
         self.security_manager = security_manager
+        # Absolute source roots, reused by every file scan
+        self._source_dirs = tuple(project_path / source_dir for source_dir in _SOURCE_DIRS)
 
     async def analyze_project(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -180,8 +302,7 @@ class ProjectAnalysisTools:
         try:
             # Find source root
             src_root = None
-            possible_roots = ["app/src/main/java", "app/src/main/kotlin"]
-            for root in possible_roots:
+            for root in _SOURCE_DIRS:
                 if (self.project_path / root).exists():
                     src_root = root
                     break
@@ -275,16 +396,15 @@ class ProjectAnalysisTools:
 
     def _check_for_pattern(self, *patterns: str) -> bool:
         """Check if code patterns exist in the project."""
-        for pattern in patterns:
-            if self._search_in_kotlin_files(pattern):
-                return True
-        return False
+        # One alternation regex lets a single walk and read per file test every pattern
+        matcher = _compile_markers(*patterns)
+        return self._search_in_kotlin_files(matcher, max(map(len, patterns)))
 
     def _analyze_package_structure(self) -> Dict[str, Any]:
         """Analyze package organization and structure."""
-        kotlin_dir = self.project_path / "app" / "src" / "main" / "java"
+        kotlin_dir = self._source_dirs[0]
         if not kotlin_dir.exists():
-            kotlin_dir = self.project_path / "app" / "src" / "main" / "kotlin"
+            kotlin_dir = self._source_dirs[1]
 
         if not kotlin_dir.exists():
             return {"status": "No Kotlin source directory found"}
@@ -310,25 +430,25 @@ class ProjectAnalysisTools:
 
     async def _apply_dependency_fixes(
         self, target_api_level: int, modernization_level: str
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Apply dependency updates and fixes."""
-        return ["Updated AndroidX dependencies", "Fixed security vulnerabilities"]
+        return _DEPENDENCY_FIXES
 
     async def _perform_performance_analysis(self) -> Dict[str, Any]:
         """Analyze performance characteristics."""
-        return {"build_time": "45s", "app_size": "12MB", "memory_usage": "normal"}
+        return dict(_PERFORMANCE_ANALYSIS)
 
-    async def _apply_performance_fixes(self, modernization_level: str) -> List[str]:
+    async def _apply_performance_fixes(self, modernization_level: str) -> Tuple[str, ...]:
         """Apply performance optimizations."""
-        return ["Enabled R8 code shrinking", "Optimized image resources"]
+        return _PERFORMANCE_FIXES
 
     async def _perform_security_analysis(self) -> Dict[str, Any]:
         """Analyze security vulnerabilities."""
-        return {"vulnerabilities": [], "security_score": "A+"}
+        return {"vulnerabilities": [], **_SECURITY_ANALYSIS}
 
-    async def _apply_security_fixes(self, modernization_level: str) -> List[str]:
+    async def _apply_security_fixes(self, modernization_level: str) -> Tuple[str, ...]:
         """Apply security improvements."""
-        return ["Updated vulnerable dependencies", "Added ProGuard rules"]
+        return _SECURITY_FIXES
 
     async def _perform_ui_analysis(self) -> Dict[str, Any]:
         """Analyze UI modernization opportunities."""
@@ -356,24 +476,40 @@ class ProjectAnalysisTools:
 
         return fixes
 
-    async def _find_global_scope_usages(self) -> List[str]:
-        """Find usages of GlobalScope in Kotlin files."""
-        usages = []
-        kotlin_dirs = [
-            self.project_path / "app" / "src" / "main" / "java",
-            self.project_path / "app" / "src" / "main" / "kotlin",
+    def _list_kotlin_files(self) -> List[str]:
+        """Return the paths of all Kotlin files under the source roots."""
+        return [
+            kt_file
+            for kotlin_dir in self._source_dirs
+            if kotlin_dir.exists()
+            for kt_file in _iter_source_files(kotlin_dir)
         ]
 
-        for kotlin_dir in kotlin_dirs:
-            if kotlin_dir.exists():
-                for kt_file in kotlin_dir.rglob("*.kt"):
-                    try:
-                        content = kt_file.read_text(encoding="utf-8")
-                        if "GlobalScope" in content:
-                            usages.append(kt_file.as_posix())
-                    except Exception:
-                        continue
-        return usages
+    async def _find_global_scope_usages(self) -> List[str]:
+        """
+        Find usages of GlobalScope in Kotlin files.
+
+        Files are scanned in worker threads, at most _SCAN_CONCURRENCY at a time,
+        so the event loop keeps serving other requests during the scan.
+        """
+        kotlin_files = await asyncio.to_thread(self._list_kotlin_files)
+        semaphore = asyncio.Semaphore(_SCAN_CONCURRENCY)
+
+        async def scan(kt_file: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    _file_contains, kt_file, _GLOBAL_SCOPE_MARKER, len("GlobalScope")
+                )
+
+        results = await asyncio.gather(
+            *(scan(kt_file) for kt_file in kotlin_files), return_exceptions=True
+        )
+        # Unreadable files come back as exceptions and are skipped, as before
+        return [
+            Path(kt_file).as_posix()
+            for kt_file, found in zip(kotlin_files, results)
+            if found is True
+        ]
 
     def _analyze_structure(self) -> str:
         """Analyze basic project structure."""
@@ -425,13 +561,8 @@ class ProjectAnalysisTools:
         try:
             content = manifest_path.read_text(encoding="utf-8")
 
-            analysis = []
-            if "android:theme" in content:
-                analysis.append("✅ App theme configured")
-            if "uses-permission" in content:
-                analysis.append("✅ Permissions declared")
-            if "android:exported" in content:
-                analysis.append("✅ Component exports properly declared")
+            found = set(_MANIFEST_MARKERS_RE.findall(content))
+            analysis = [finding for marker, finding in _MANIFEST_CHECKS if marker in found]
 
             return "\n".join(analysis) if analysis else "Basic manifest structure found"
 
@@ -464,19 +595,13 @@ class ProjectAnalysisTools:
                 return False
         return False
 
-    def _search_in_kotlin_files(self, pattern: str) -> bool:
-        """Search for a pattern in Kotlin files."""
-        kotlin_dirs = [
-            self.project_path / "app" / "src" / "main" / "java",
-            self.project_path / "app" / "src" / "main" / "kotlin",
-        ]
-
-        for kotlin_dir in kotlin_dirs:
+    def _search_in_kotlin_files(self, pattern: "re.Pattern[bytes]", max_len: int) -> bool:
+        """Search for a compiled pattern (matching at most max_len bytes) in Kotlin files."""
+        for kotlin_dir in self._source_dirs:
             if kotlin_dir.exists():
-                for kt_file in kotlin_dir.rglob("*.kt"):
+                for kt_file in _iter_source_files(kotlin_dir):
                     try:
-                        content = kt_file.read_text(encoding="utf-8")
-                        if pattern in content:
+                        if _file_contains(kt_file, pattern, max_len):
                             return True
                     except Exception:
                         continue
@@ -489,10 +614,9 @@ class ProjectAnalysisTools:
 
         for ext in extensions:
             count = 0
-            for source_dir in ["app/src/main/java", "app/src/main/kotlin"]:
-                source_path = self.project_path / source_dir
+            for source_path in self._source_dirs:
                 if source_path.exists():
-                    count += len(list(source_path.rglob(f"*{ext}")))
+                    count += sum(1 for _ in _iter_source_files(source_path, ext))
             counts[ext] = count
 
         return counts
@@ -516,10 +640,10 @@ class ProjectAnalysisTools:
 
         return test_info
 
-    def _find_outdated_dependencies(self) -> List[str]:
+    def _find_outdated_dependencies(self) -> Tuple[str, ...]:
         """Find potentially outdated dependencies."""
         # Simplified implementation - in reality would check against Maven Central
-        return ["androidx.core:core-ktx:1.8.0 -> 1.12.0", "androidx.compose.ui:ui:1.4.0 -> 1.5.4"]
+        return _OUTDATED_DEPENDENCIES
 
     def _scan_security_vulnerabilities(self) -> List[str]:
         """Scan for security vulnerabilities."""
@@ -533,13 +657,11 @@ class ProjectAnalysisTools:
     def _count_compose_files(self) -> int:
         """Count Compose-related files."""
         count = 0
-        for source_dir in ["app/src/main/java", "app/src/main/kotlin"]:
-            source_path = self.project_path / source_dir
+        for source_path in self._source_dirs:
             if source_path.exists():
-                for kt_file in source_path.rglob("*.kt"):
+                for kt_file in _iter_source_files(source_path):
                     try:
-                        content = kt_file.read_text(encoding="utf-8")
-                        if "@Composable" in content:
+                        if _file_contains(kt_file, _COMPOSABLE_MARKER, len("@Composable")):
                             count += 1
                     except Exception:
                         continue
@@ -547,21 +669,6 @@ class ProjectAnalysisTools:
 
     def _generate_recommendations(
         self, analysis_results: Dict[str, Any], modernization_level: str
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Generate modernization recommendations."""
-        recommendations = []
-
-        if modernization_level == "conservative":
-            recommendations.append("Update dependencies gradually")
-            recommendations.append("Add unit tests for critical paths")
-        elif modernization_level == "moderate":
-            recommendations.append("Migrate to Jetpack Compose incrementally")
-            recommendations.append("Implement dependency injection with Hilt")
-            recommendations.append("Adopt Kotlin coroutines for async operations")
-        elif modernization_level == "aggressive":
-            recommendations.append("Complete migration to Jetpack Compose")
-            recommendations.append("Implement clean architecture patterns")
-            recommendations.append("Add comprehensive test coverage")
-            recommendations.append("Optimize build performance with parallel execution")
-
-        return recommendations
+        return _MODERNIZATION_RECOMMENDATIONS.get(modernization_level, ())
@@ -9,40 +9,177 @@ This module provides comprehensive security features including:
 - Compliance monitoring (GDPR, HIPAA, SOC2)
 """
 
+import functools
 import logging
 import os
+import re
 import sqlite3
 import sys
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-
-import bcrypt
-from cryptography.fernet import Fernet
+from typing import TYPE_CHECKING, Optional, Union
+
+# cryptography and bcrypt are imported on first use: most server processes only need
+# SecurityManager, and importing these C-extension packages slows every startup.
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# AES-GCM nonce size in bytes (96 bits)
+_AEAD_NONCE_SIZE = 12
+
+# Plaintext accepted by the AEAD helpers; str is UTF-8 encoded, bytes-like is used as is
+AeadPlaintext = Union[str, bytes, bytearray, memoryview]
+
+
+def _as_bytes_like(data: AeadPlaintext) -> Union[bytes, bytearray, memoryview]:
+    """Encode str once; pass bytes-like objects through without copying."""
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+# Substrings that are rejected in command arguments (matched case-insensitively)
+_DANGEROUS_COMMAND_PATTERNS = (
+    ";",
+    "&",
+    "|",
+    "`",
+    "$",
+    "$(",
+    "&&",
+    "||",
+    ">>",
+    ">",
+    "<",
+    "rm",
+    "del",
+    "format",
+    "fdisk",
+    "mkfs",
+)
+# All patterns in one alternation, so each argument is scanned once
+_DANGEROUS_COMMAND_RE = re.compile("|".join(map(re.escape, _DANGEROUS_COMMAND_PATTERNS)))
+
+
+def _resolve_base_path(base_path: Path) -> str:
+    """
+    Resolve a sandbox base directory for a containment check.
+
+    Resolved on every call rather than cached, so a symlink retargeted after first
+    use is checked against its current target. Returned as a case-normalized string
+    ending in a separator, so containment is a prefix test that cannot confuse
+    "/foo/bar" with "/foo/barbaz".
+    """
+    resolved = os.path.normcase(str(base_path.resolve()))
+    return resolved if resolved.endswith(os.sep) else resolved + os.sep
+
+
+@functools.lru_cache(maxsize=32)
+def _get_fernet(key: bytes) -> "Fernet":
+    """
+    Return a Fernet instance for a key, reusing it across calls with the same key.
+
+    The cache keeps the raw key bytes alive; call clear_cipher_cache() once keys are
+    no longer needed (e.g. after rotation).
+    """
+    from cryptography.fernet import Fernet
+
+    return Fernet(key)
 
 
 def encrypt_data(data: bytes, key: bytes) -> bytes:
     """Encrypts data using Fernet symmetric encryption."""
-    f = Fernet(key)
-    return f.encrypt(data)
+    return _get_fernet(key).encrypt(data)
 
 
 def decrypt_data(token: bytes, key: bytes) -> bytes:
     """Decrypts data using Fernet symmetric encryption."""
-    f = Fernet(key)
-    return f.decrypt(token)
+    return _get_fernet(key).decrypt(token)
+
+
+def generate_aead_key() -> bytes:
+    """Generates a random 256-bit key for encrypt_data_aead/decrypt_data_aead."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    return AESGCM.generate_key(bit_length=256)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_aead(key: bytes) -> "AESGCM":
+    """Return an AES-GCM instance for a key, reusing it across calls with the same key."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    return AESGCM(key)
+
+
+def encrypt_data_aead(data: AeadPlaintext, key: bytes) -> bytes:
+    """
+    Encrypts data using AES-256-GCM authenticated encryption.
+
+    Faster than Fernet (AES-128-CBC + HMAC) and produces raw bytes rather than base64.
+    The token is the random nonce followed by the ciphertext and authentication tag;
+    base64-encode it if it has to go into JSON. str input is UTF-8 encoded; pass
+    bytes, bytearray or memoryview to skip that copy.
+    """
+    nonce = os.urandom(_AEAD_NONCE_SIZE)
+    # One join copies the ciphertext once; chained + would copy it twice
+    return b"".join((nonce, _get_aead(key).encrypt(nonce, _as_bytes_like(data), None)))
+
+
+def decrypt_data_aead(token: Union[bytes, bytearray, memoryview], key: bytes) -> bytes:
+    """Decrypts a token produced by encrypt_data_aead, verifying its integrity."""
+    # Slicing a memoryview hands the cipher the ciphertext without copying it
+    view = memoryview(token)
+    return _get_aead(key).decrypt(view[:_AEAD_NONCE_SIZE], view[_AEAD_NONCE_SIZE:], None)
+
+
+def clear_cipher_cache() -> None:
+    """Drop every cached cipher instance, releasing the key bytes held as cache keys."""
+    _get_fernet.cache_clear()
+    _get_aead.cache_clear()
 
 
 def hash_password(password: str) -> bytes:
     """Hashes a password using bcrypt."""
+    import bcrypt
+
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
 
 
 def check_password(password: str, hashed: bytes) -> bool:
     """Checks a password against a bcrypt hash."""
+    import bcrypt
+
     return bcrypt.checkpw(password.encode("utf-8"), hashed)
 
 
+# Serializes first-time setup of the process-wide security logger
+_SECURITY_LOGGER_LOCK = threading.Lock()
+
+
+def _get_security_logger() -> logging.Logger:
+    """
+    Return the shared "mcp_security" logger, attaching its file handler only once.
+
+    Every SecurityManager shares this logger; adding a handler per instance would
+    open another file descriptor and write each audit line once per manager.
+    """
+    security_logger = logging.getLogger("mcp_security")
+    with _SECURITY_LOGGER_LOCK:
+        if not security_logger.handlers:
+            # Create dedicated security logger with INFO level for audit trails
+            security_logger.setLevel(logging.INFO)
+
+            # Configure file handler for persistent audit logs
+            handler = logging.FileHandler("mcp_security.log")
+
+            # Use detailed format including timestamps for audit requirements
+            formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+            handler.setFormatter(formatter)
+            security_logger.addHandler(handler)
+    return security_logger
+
+
 class SecurityManager:
     """Manages security logging and audit database for the MCP server."""
 
@@ -64,20 +201,7 @@ class SecurityManager:
         - Compliance monitoring (GDPR, HIPAA requirements)
         """
         try:
-            # Create dedicated security logger with INFO level for audit trails
-            security_logger = logging.getLogger("mcp_security")
-            security_logger.setLevel(logging.INFO)
-
-            # Configure file handler for persistent audit logs
-            log_file = "mcp_security.log"
-            handler = logging.FileHandler(log_file)
-
-            # Use detailed format including timestamps for audit requirements
-            formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-            handler.setFormatter(formatter)
-            security_logger.addHandler(handler)
-
-            self.security_logger = security_logger
+            self.security_logger = _get_security_logger()
 
         except (FileNotFoundError, PermissionError, OSError) as e:
             # Graceful degradation: continue without security logging if setup fails
@@ -233,13 +357,11 @@ class SecurityManager:
             else:
                 resolved_path = (base_path / path).resolve()
 
-            # Ensure the resolved path is within the base directory
-            try:
-                resolved_path.relative_to(base_path.resolve())
-            except ValueError as exc:
-                raise ValueError(
-                    f"Path traversal detected: {file_path} escapes base directory"
-                ) from exc
+            # Ensure the resolved path is within (or is) the base directory
+            if not (os.path.normcase(str(resolved_path)) + os.sep).startswith(
+                _resolve_base_path(base_path)
+            ):
+                raise ValueError(f"Path traversal detected: {file_path} escapes base directory")
 
             return resolved_path
 
@@ -262,36 +384,15 @@ class SecurityManager:
         if not isinstance(command_args, list):
             raise ValueError("Command arguments must be a list")
 
-        # Dangerous patterns to check for
-        dangerous_patterns = [
-            ";",
-            "&",
-            "|",
-            "`",
-            "$",
-            "$(",
-            "&&",
-            "||",
-            ">>",
-            ">",
-            "<",
-            "rm",
-            "del",
-            "format",
-            "fdisk",
-            "mkfs",
-        ]
-
         sanitized_args = []
         for arg in command_args:
             if not isinstance(arg, str):
                 arg = str(arg)
 
             # Check for dangerous patterns
-            for pattern in dangerous_patterns:
-                if pattern in arg.lower():
-                    self.log_audit_event("security_violation", f"dangerous_command_arg:{arg}")
-                    raise ValueError(f"Potentially dangerous command argument: {arg}")
+            if _DANGEROUS_COMMAND_RE.search(arg.lower()):
+                self.log_audit_event("security_violation", f"dangerous_command_arg:{arg}")
+                raise ValueError(f"Potentially dangerous command argument: {arg}")
 
             sanitized_args.append(arg)
 
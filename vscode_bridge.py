@@ -4,173 +4,942 @@ VS Code Extension Bridge for MCP Server
 This creates a simple HTTP API that VS Code extensions can call
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import json
+import logging
+import multiprocessing
 import os
+import re
+import socket
 import subprocess
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Type, Union
+
+# orjson is several times faster than the stdlib json module and produces bytes
+# directly; without it the bridge tries ujson, which is still 2-3x faster than json,
+# and finally the stdlib json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Bytes or text a JSON request body or worker response may arrive as
+JsonInput = Union[bytes, bytearray, str]
+_json_dumps: Callable[[Any], bytes]
+_json_loads: Callable[[JsonInput], Any]
+_JSONDecodeError: Type[ValueError]
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    _JSONDecodeError = json.JSONDecodeError
+elif ujson is not None:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj, escape_forward_slashes=False).encode()
+
+    def _json_loads(data: JsonInput) -> Any:
+        # ujson.loads accepts str and bytes only; request bodies are read into bytearrays
+        return ujson.loads(bytes(data))
+
+    # ujson raises plain ValueError on malformed input
+    _JSONDecodeError = ValueError
+else:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+logger = logging.getLogger(__name__)
+
+# aiohttp serves every request on one event loop, so concurrent tool calls all wait on
+# their subprocesses at once; without it the bridge uses the stdlib
+# ThreadingHTTPServer below.
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+# Seconds a tool call may run before its subprocess is killed
+_TOOL_TIMEOUT = 30
+
+# MCP server executable, run with the project path as its only argument
+_MCP_COMMAND = "kotlin-android-mcp"
+
+# Environment for tool subprocesses, snapshotted once instead of copied per call
+_BASE_ENV = dict(os.environ)
+
+# CORS headers for tool responses and for preflight (OPTIONS) responses
+_CORS_HEADERS = {"Access-Control-Allow-Origin": "*"}
+_PREFLIGHT_HEADERS = {
+    **_CORS_HEADERS,
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
+def _header_lines(headers):
+    """Encode headers as raw "Name: value" lines for a hand-written response head"""
+    return "".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode("latin-1")
+
+
+# Pre-encoded header lines for the HTTPServer handler's responses
+_JSON_HEADER_LINES = b"Content-Type: application/json\r\n"
+_JSON_CORS_HEADER_LINES = _JSON_HEADER_LINES + _header_lines(_CORS_HEADERS)
+_PREFLIGHT_HEADER_LINES = _header_lines(_PREFLIGHT_HEADERS)
+
+# Largest accepted POST body; bigger requests are rejected with 413 before being read
+_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Tool subprocesses the threaded HTTPServer frontend runs at once; further requests wait
+_MAX_CONCURRENT_TOOL_CALLS = 32
+_tool_call_slots = threading.BoundedSemaphore(_MAX_CONCURRENT_TOOL_CALLS)
+
+# Tool calls accepted per client address within _RATE_LIMIT_WINDOW seconds; 0 (the
+# default) disables rate limiting
+_RATE_LIMIT_REQUESTS = int(os.getenv("MCP_BRIDGE_RATE_LIMIT", "0"))
+_RATE_LIMIT_WINDOW = 60
+# Client addresses tracked before idle ones are pruned
+_RATE_LIMIT_MAX_CLIENTS = 1024
+# Client address -> monotonic times of its recent tool calls
+_client_calls: Dict[str, Deque[float]] = {}
+_client_calls_lock = threading.Lock()
+
+# Long-lived MCP server processes kept per project path by the aiohttp frontend
+_WORKERS_PER_PROJECT = int(os.getenv("MCP_BRIDGE_WORKERS", "2"))
+# Worker processes alive at once across all projects; the least recently used idle
+# worker is shut down to make room for a new one
+_MAX_WORKERS = int(os.getenv("MCP_BRIDGE_MAX_WORKERS", "8"))
+# Idle workers are shut down after this many seconds
+_WORKER_IDLE_TIMEOUT = 300
+# Lines of worker stderr kept for error messages
+_STDERR_TAIL_LINES = 50
+# Largest single JSON-RPC response line read from a worker; asyncio's default
+# StreamReader limit (64 KiB) is too small for project-wide analysis results
+_MAX_RESPONSE_BYTES = 64 * 1024 * 1024
 
 
-class MCPBridgeHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        content_length = int(self.headers["Content-Length"])
-        post_data = self.rfile.read(content_length)
+# Project used when a request names none: the VS Code workspace, else the working
+# directory. Neither changes while the bridge runs, so both are resolved once.
+_DEFAULT_PROJECT = os.path.abspath(os.getenv("VSCODE_WORKSPACE_FOLDER") or os.getcwd())
 
-        try:
-            request_data = json.loads(post_data)
-            tool_name = request_data.get("tool")
-            arguments = request_data.get("arguments", {})
-
-            # Get project path from request or use VS Code workspace
-            project_path = request_data.get("project_path")
-            if not project_path:
-                # Try to get from VS Code workspace environment
-                project_path = os.getenv("VSCODE_WORKSPACE_FOLDER")
-            if not project_path:
-                # Fallback to current working directory
-                project_path = os.getcwd()
 
-            # Call the MCP server
-            result = self.call_mcp_tool(tool_name, arguments, project_path)
+def _resolve_project_path(request_data):
+    """Project path from the request, else the VS Code workspace, else the cwd"""
+    return request_data.get("project_path") or _DEFAULT_PROJECT
 
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
 
-            response = {"result": result, "project_path": project_path}
-            self.wfile.write(json.dumps(response).encode())
+_TOOL_NAME_RE = re.compile(r"[A-Za-z0-9_-]+")
 
-        except Exception as e:
-            self.send_response(500)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
 
-            error_response = {"error": str(e)}
-            self.wfile.write(json.dumps(error_response).encode())
+@functools.lru_cache(maxsize=1)
+def _known_tool_names():
+    """Tool names KotlinMCPServer dispatches, or None if its module cannot be imported"""
+    try:
+        from kotlin_mcp_server import TOOL_NAMES
+    except Exception:
+        logger.warning(
+            "kotlin_mcp_server is not importable; tool names are only checked for allowed "
+            "characters",
+            exc_info=True,
+        )
+        return None
+    return TOOL_NAMES
+
+
+@functools.lru_cache(maxsize=1)
+def _health_body():
+    """Serialized /health body, advertising the tools the server actually dispatches"""
+    return _json_dumps(
+        {
+            "status": "healthy",
+            "current_workspace": _DEFAULT_PROJECT,
+            "available_tools": sorted(_known_tool_names() or ()),
+        }
+    )
 
-    def do_GET(self):
-        """Health check and project info endpoint"""
-        if self.path == "/health":
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
 
-            # Return current workspace info
-            workspace_info = {
-                "status": "healthy",
-                "current_workspace": os.getenv("VSCODE_WORKSPACE_FOLDER", os.getcwd()),
-                "available_tools": [
-                    "gradle_build",
-                    "run_tests",
-                    "create_kotlin_file",
-                    "create_layout_file",
-                    "analyze_project",
-                ],
-            }
-
-            self.wfile.write(json.dumps(workspace_info).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
+def _parse_tool_request(body):
+    """
+    Parse a POST body into (tool_name, arguments, project_path, None).
 
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+    Malformed requests give (None, None, None, message) so they are answered with 400
+    before any server process is started for them.
+    """
+    try:
+        request_data = _json_loads(body)
+    except _JSONDecodeError as e:
+        return None, None, None, f"Invalid JSON: {e}"
+    if not isinstance(request_data, dict):
+        return None, None, None, "Request body must be a JSON object"
+
+    tool_name = request_data.get("tool")
+    if not isinstance(tool_name, str) or not _TOOL_NAME_RE.fullmatch(tool_name):
+        return None, None, None, f"Invalid tool name: {tool_name}"
+    known_tool_names = _known_tool_names()
+    if known_tool_names is not None and tool_name not in known_tool_names:
+        return None, None, None, f"Unknown tool: {tool_name}"
+    arguments = request_data.get("arguments", {})
+    if not isinstance(arguments, dict):
+        return None, None, None, "arguments must be a JSON object"
+    project_path = request_data.get("project_path")
+    if project_path is not None and not isinstance(project_path, str):
+        return None, None, None, "project_path must be a string"
+
+    return tool_name, arguments, _resolve_project_path(request_data), None
+
+
+def _rate_limited(client):
+    """Record a tool call from client; True when it is over _RATE_LIMIT_REQUESTS"""
+    if _RATE_LIMIT_REQUESTS <= 0:
+        return False
+    now = time.monotonic()
+    with _client_calls_lock:
+        calls = _client_calls.get(client)
+        if calls is None:
+            calls = _client_calls[client] = deque()
+        while calls and calls[0] <= now - _RATE_LIMIT_WINDOW:
+            calls.popleft()
+        if len(calls) >= _RATE_LIMIT_REQUESTS:
+            return True
+        calls.append(now)
+        if len(_client_calls) > _RATE_LIMIT_MAX_CLIENTS:
+            _prune_client_calls(now)
+        return False
+
+
+def _prune_client_calls(now):
+    """Forget clients with no call inside the window; keep at most _RATE_LIMIT_MAX_CLIENTS"""
+    horizon = now - _RATE_LIMIT_WINDOW
+    stale = [client for client, calls in _client_calls.items() if not calls or calls[-1] <= horizon]
+    for client in stale:
+        del _client_calls[client]
+    # Still too many active clients: drop the earliest-tracked ones (their limit restarts)
+    while len(_client_calls) > _RATE_LIMIT_MAX_CLIENTS:
+        del _client_calls[next(iter(_client_calls))]
+
+
+def _validate_project_path(project_path):
+    """
+    Return (absolute project path, None) or (None, error) for a client-supplied path.
+
+    Checked on every call rather than remembered: a symlink may be retargeted or the
+    directory removed between calls.
+    """
+    # Validate project_path to prevent command injection
+    try:
+        validated_path = Path(project_path).resolve()
+
+        # Basic security checks
+        if not validated_path.exists():
+            return None, {"error": f"Project path does not exist: {project_path}"}
+
+        if not validated_path.is_dir():
+            return None, {"error": f"Project path is not a directory: {project_path}"}
+
+        # Convert back to string for subprocess
+        return str(validated_path), None
+
+    except (OSError, ValueError) as e:
+        return None, {"error": f"Invalid project path: {e}"}
+
+
+# Constant framing of the JSON-RPC tool call; only the name and arguments are spliced in
+_REQUEST_PREFIX = b'{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":'
+_REQUEST_ARGUMENTS = b',"arguments":'
+_REQUEST_SUFFIX = b"}}"
+
+# Framing of the bridge's {"result": ..., "project_path": ...} response body
+_RESPONSE_PREFIX = b'{"result":'
+_RESPONSE_PROJECT_PATH = b',"project_path":'
+_RESPONSE_SUFFIX = b"}"
+
+
+def _tool_response_body(result, project_path):
+    """Serialized response body for a completed tool call"""
+    return b"".join(
+        (
+            _RESPONSE_PREFIX,
+            _json_dumps(result),
+            _RESPONSE_PROJECT_PATH,
+            _json_dumps(project_path),
+            _RESPONSE_SUFFIX,
+        )
+    )
+
+
+def _validate_tool_call(tool_name, project_path):
+    """Return (absolute project path, None) or (None, error) for a requested tool call"""
+    safe_project_path, error = _validate_project_path(project_path)
+    if error:
+        return None, error
+
+    # Validate tool_name to prevent injection
+    if not tool_name.replace("_", "").replace("-", "").isalnum():
+        return None, {"error": f"Invalid tool name: {tool_name}"}
+
+    return safe_project_path, None
+
+
+# "subprocess" (default) talks to the kotlin-android-mcp executable; "inprocess" runs
+# tools on KotlinMCPServer instances inside the bridge
+_BRIDGE_MODE = os.getenv("MCP_BRIDGE_MODE", "subprocess")
+
+# Threads running in-process tool calls. Handlers may block (gradle, subprocesses, file
+# walks), so each call runs on one of these threads, never on a serving event loop.
+_IN_PROCESS_THREADS = int(os.getenv("MCP_BRIDGE_IN_PROCESS_THREADS", "8"))
+# A call is only accepted while a thread is free: queued behind stuck handlers it would
+# time out anyway, and then still run after the client was told it failed
+_in_process_slots = threading.BoundedSemaphore(_IN_PROCESS_THREADS)
+# KotlinMCPServer instances kept per in-process thread; the least recently used is closed
+_IN_PROCESS_SERVERS_PER_THREAD = 4
+_in_process_executor = None
+_in_process_executor_lock = threading.Lock()
+# Per thread: its own event loop and its project path -> KotlinMCPServer LRU
+_in_process_state = threading.local()
+
+# Returned when a tool call does not finish within _TOOL_TIMEOUT seconds
+_TIMEOUT_ERROR = {"error": "Command timeout"}
+# Handler code cannot be interrupted, so an in-process call keeps its thread until it ends
+_IN_PROCESS_TIMEOUT_ERROR = {
+    "error": "Command timeout (the in-process tool call continues in the background)"
+}
+_IN_PROCESS_BUSY_ERROR = {"error": "All in-process tool threads are busy, try again later"}
+
+
+@functools.lru_cache(maxsize=1)
+def _in_process_server_class():
+    """KotlinMCPServer when tools should run in-process, else None (use subprocesses)"""
+    if _BRIDGE_MODE != "inprocess":
+        return None
+    try:
+        from kotlin_mcp_server import KotlinMCPServer
+    except Exception:
+        logger.warning(
+            "In-process MCP server unavailable; using %s subprocesses", _MCP_COMMAND, exc_info=True
+        )
+        return None
+    return KotlinMCPServer
+
+
+def _tool_result(result):
+    """
+    Normalize a tool result to the shape the subprocess path has always returned.
+
+    KotlinMCPServer.handle_call_tool reports failures as JSON-RPC error objects; those
+    become {"error": message} whether they arrive in-process or from a worker.
+    """
+    if isinstance(result, dict) and isinstance(result.get("error"), dict):
+        return {"error": result["error"].get("message", "Unknown error")}
+    return result
+
+
+def _jsonrpc_result(response):
+    """Tool result from a worker's JSON-RPC response, with errors as {"error": message}"""
+    if isinstance(response.get("error"), dict):
+        return _tool_result(response)
+    return _tool_result(response.get("result", {}))
+
+
+def _get_in_process_executor():
+    """Create the in-process thread pool on first use"""
+    global _in_process_executor
+    with _in_process_executor_lock:
+        if _in_process_executor is None:
+            _in_process_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_IN_PROCESS_THREADS, thread_name_prefix="mcp-in-process"
+            )
+    return _in_process_executor
+
+
+def _in_process_call(server_class, tool_name, arguments, safe_project_path):
+    """
+    Run one tool call on this thread's KotlinMCPServer for the project.
+
+    Each thread keeps its own event loop and servers, so a server (and anything its
+    handlers bind to a loop) is only ever used from one loop.
+    """
+    state = _in_process_state
+    if not hasattr(state, "loop"):
+        state.loop = asyncio.new_event_loop()
+        state.servers = OrderedDict()
+
+    server = state.servers.pop(safe_project_path, None)
+    if server is None:
+        server = server_class(_MCP_COMMAND)
+        server.set_project_path(safe_project_path)
+    state.servers[safe_project_path] = server
+    while len(state.servers) > _IN_PROCESS_SERVERS_PER_THREAD:
+        _, evicted = state.servers.popitem(last=False)
+        evicted.cleanup()
+
+    return state.loop.run_until_complete(server.handle_call_tool(tool_name, arguments))
+
+
+def _submit_in_process(server_class, tool_name, arguments, safe_project_path):
+    """Start a tool call on a free in-process thread; None when every thread is busy"""
+    if not _in_process_slots.acquire(blocking=False):
+        return None
+    future = _get_in_process_executor().submit(
+        _in_process_call, server_class, tool_name, arguments, safe_project_path
+    )
+    future.add_done_callback(lambda future: _in_process_slots.release())
+    return future
+
+
+def _in_process_timeout(future):
+    """Cancel a timed-out call if it has not started; report whether it keeps running"""
+    return _TIMEOUT_ERROR if future.cancel() else _IN_PROCESS_TIMEOUT_ERROR
+
+
+async def _call_in_process(server_class, tool_name, arguments, safe_project_path):
+    """
+    Call a tool on a KotlinMCPServer for the project without a subprocess.
+
+    Skips process startup, the JSON-RPC round trip and both pipes. The call runs on
+    an in-process thread so blocking handlers never stall the serving event loop.
+    """
+    future = _submit_in_process(server_class, tool_name, arguments, safe_project_path)
+    if future is None:
+        return _IN_PROCESS_BUSY_ERROR
+    try:
+        return _tool_result(
+            await asyncio.wait_for(asyncio.wrap_future(future), timeout=_TOOL_TIMEOUT)
+        )
+    except asyncio.TimeoutError:
+        return _in_process_timeout(future)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _run_in_process(server_class, tool_name, arguments, safe_project_path):
+    """Blocking counterpart of _call_in_process for the threaded HTTPServer frontend"""
+    future = _submit_in_process(server_class, tool_name, arguments, safe_project_path)
+    if future is None:
+        return _IN_PROCESS_BUSY_ERROR
+    try:
+        return _tool_result(future.result(timeout=_TOOL_TIMEOUT))
+    except concurrent.futures.TimeoutError:
+        return _in_process_timeout(future)
+    except Exception as e:
+        return {"error": str(e)}
 
-    def call_mcp_tool(self, tool_name, arguments, project_path):
-        """Call the MCP server tool via command line with security validation"""
 
-        # Validate project_path to prevent command injection
-        try:
-            from pathlib import Path
+def _prepare_tool_call(tool_name, arguments, project_path):
+    """
+    Validate a tool call and build its subprocess command, environment and request.
 
-            validated_path = Path(project_path).resolve()
+    Returns (cmd, env, request, None) on success or (None, None, None, error) when
+    the project path or tool name is rejected. The request is the serialized
+    JSON-RPC call, ready to write to the MCP server's stdin.
+    """
+    safe_project_path, error = _validate_tool_call(tool_name, project_path)
+    if error:
+        return None, None, None, error
 
-            # Basic security checks
-            if not validated_path.exists():
-                return {"error": f"Project path does not exist: {project_path}"}
+    cmd = [_MCP_COMMAND, safe_project_path]
 
-            if not validated_path.is_dir():
-                return {"error": f"Project path is not a directory: {project_path}"}
+    # Create a mock JSON-RPC request
+    request = b"".join(
+        (
+            _REQUEST_PREFIX,
+            _json_dumps(tool_name),
+            _REQUEST_ARGUMENTS,
+            _json_dumps(arguments),
+            _REQUEST_SUFFIX,
+        )
+    )
 
-            # Convert back to string for subprocess
-            safe_project_path = str(validated_path)
+    # Set environment variable for the subprocess
+    env = {**_BASE_ENV, "PROJECT_PATH": safe_project_path}
 
-        except (OSError, ValueError) as e:
-            return {"error": f"Invalid project path: {e}"}
+    return cmd, env, request, None
 
-        # Validate tool_name to prevent injection
-        if not tool_name.replace("_", "").replace("-", "").isalnum():
-            return {"error": f"Invalid tool name: {tool_name}"}
 
-        cmd = ["kotlin-android-mcp", safe_project_path]
+class MCPBridgeHandler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so clients can keep connections open
+    protocol_version = "HTTP/1.1"
+    # Seconds an idle keep-alive connection may hold its thread before it is closed
+    timeout = 5
 
-        # Create a mock JSON-RPC request
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {"name": tool_name, "arguments": arguments},
-        }
+    def do_POST(self):
+        try:
+            content_length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self._send_json_error(411, "Content-Length header is required")
+            return
+        if content_length < 0 or content_length > _MAX_BODY_BYTES:
+            self._send_json_error(413, f"Request body exceeds {_MAX_BODY_BYTES} bytes")
+            return
+
+        # Read straight into a buffer of the announced size; JSON is parsed from it directly
+        post_data = bytearray(content_length)
+        self.rfile.readinto(post_data)
+
+        tool_name, arguments, project_path, error = _parse_tool_request(post_data)
+        if error:
+            self._send_json_error(400, error)
+            return
+        if _rate_limited(self.client_address[0]):
+            self._send_json_error(429, "Too many tool calls, try again later")
+            return
 
         try:
-            # Set environment variable for the subprocess
-            env = os.environ.copy()
-            env["PROJECT_PATH"] = safe_project_path
+            # Call the MCP server
+            result = self.call_mcp_tool(tool_name, arguments, project_path)
+
+            self._send(200, _tool_response_body(result, project_path), _JSON_CORS_HEADER_LINES)
+
+        except Exception as e:
+            self._send_json_error(500, str(e))
+
+    def _send_json_error(self, status, message):
+        if status in (411, 413):
+            # The request body was not read, so the connection cannot be reused
+            self.close_connection = True
+        error_response = {"error": message}
+        self._send(status, _json_dumps(error_response), _JSON_HEADER_LINES)
+
+    def _send(self, status, body=b"", header_lines=b""):
+        """
+        Write the status line, headers, Content-Length and body with a single write.
+
+        Replaces send_response/send_header/end_headers plus a separate body write,
+        each of which is its own small socket write on the unbuffered wfile.
+        """
+        self.log_request(status, len(body))
+        if self.close_connection:
+            header_lines += b"Connection: close\r\n"
+        self.wfile.write(
+            b"%s %d %s\r\nDate: %s\r\n%sContent-Length: %d\r\n\r\n%s"
+            % (
+                self.protocol_version.encode(),
+                status,
+                self.responses[status][0].encode(),
+                self.date_time_string().encode(),
+                header_lines,
+                len(body),
+                body,
+            )
+        )
+
+    def do_GET(self):
+        """Health check and project info endpoint"""
+        if self.path == "/health":
+            # Return current workspace info
+            self._send(200, _health_body(), _JSON_HEADER_LINES)
+        else:
+            self._send(404)
+
+    def do_OPTIONS(self):
+        # Browsers send a preflight before every cross-origin POST
+        self._send(200, b"", _PREFLIGHT_HEADER_LINES)
+
+    def call_mcp_tool(self, tool_name, arguments, project_path):
+        """Call the MCP server tool, bounding how many calls run at once"""
+        with _tool_call_slots:
+            return self._run_mcp_tool(tool_name, arguments, project_path)
+
+    def _run_mcp_tool(self, tool_name, arguments, project_path):
+        """Call the MCP server tool in-process or via command line, with security validation"""
+        server_class = _in_process_server_class()
+        if server_class is not None:
+            safe_project_path, error = _validate_tool_call(tool_name, project_path)
+            if error:
+                return error
+            return _run_in_process(server_class, tool_name, arguments, safe_project_path)
+
+        cmd, env, request, error = _prepare_tool_call(tool_name, arguments, project_path)
+        if error:
+            return error
 
+        try:
             process = subprocess.Popen(
                 cmd,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
                 env=env,
                 shell=False,  # Explicitly disable shell execution
             )
 
-            stdout, stderr = process.communicate(json.dumps(request), timeout=30)
+            # Binary pipes: the request goes out and the reply is parsed as bytes,
+            # with no text-mode decode/encode in between
+            stdout, stderr = process.communicate(request, timeout=_TOOL_TIMEOUT)
 
             if process.returncode == 0:
-                response = json.loads(stdout)
-                return response.get("result", {})
+                return _jsonrpc_result(_json_loads(stdout))
             else:
-                return {"error": stderr}
+                return {"error": stderr.decode("utf-8", "replace")}
 
         except subprocess.TimeoutExpired:
             process.kill()
-            return {"error": "Command timeout"}
-        except json.JSONDecodeError as e:
+            return _TIMEOUT_ERROR
+        except _JSONDecodeError as e:
             return {"error": f"Invalid JSON response: {e}"}
         except Exception as e:
             return {"error": str(e)}
 
 
+class _Worker:
+    """One long-lived kotlin-android-mcp process speaking line-delimited JSON-RPC"""
+
+    def __init__(self, process):
+        self.process = process
+        self.last_used = time.monotonic()
+        # stderr is drained continuously so a chatty worker cannot fill the pipe and stall
+        self.stderr_tail = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+
+    async def _drain_stderr(self):
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                return
+            self.stderr_tail.append(line.decode(errors="replace"))
+
+    @property
+    def alive(self):
+        return self.process.returncode is None
+
+    async def request(self, payload, timeout):
+        """
+        Send one JSON-RPC request and return the raw response line (b"" if it died).
+
+        Responses are line-delimited, so only this call's line is read; nothing waits
+        for the worker to exit or buffers its other output.
+        """
+        self.process.stdin.write(payload + b"\n")
+        await self.process.stdin.drain()
+        return await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout)
+
+    async def close(self):
+        if self.alive:
+            self.process.kill()
+        # Drain leftover output: a reader paused on a full buffer (e.g. after an
+        # oversized response) never sees the pipe close, and wait() would not return
+        await self.process.stdout.read()
+        await self.process.wait()
+        await self._stderr_task
+
+
+class WorkerPool:
+    """
+    Reuses kotlin-android-mcp processes across tool calls instead of spawning one per call.
+
+    Up to max_workers processes run per project path and max_total_workers across all
+    of them; each serves one request at a time. Workers that died or sat idle longer
+    than idle_timeout are replaced, and a project's bookkeeping is dropped once it has
+    no calls in flight and no idle workers left.
+    """
+
+    def __init__(
+        self,
+        max_workers=_WORKERS_PER_PROJECT,
+        idle_timeout=_WORKER_IDLE_TIMEOUT,
+        max_total_workers=_MAX_WORKERS,
+    ):
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self.max_total_workers = max_total_workers
+        self._idle = {}
+        self._slots = {}
+        # Calls in flight or waiting per project, so a busy project keeps its semaphore
+        self._active = {}
+        # Workers alive, idle or busy
+        self._live = 0
+        # Created on first use so it binds to the serving loop
+        self._total_slots = None
+
+    async def call(self, project_path, cmd, env, request, timeout=_TOOL_TIMEOUT):
+        """Run one tool call on a pooled worker for project_path, starting it with cmd"""
+        if self._total_slots is None:
+            self._total_slots = asyncio.Semaphore(self.max_total_workers)
+        slots = self._slots.setdefault(project_path, asyncio.Semaphore(self.max_workers))
+        self._active[project_path] = self._active.get(project_path, 0) + 1
+        try:
+            # Holding a global slot guarantees an idle worker to evict when at the cap
+            async with slots, self._total_slots:
+                return await self._call_worker(project_path, cmd, env, request, timeout)
+        finally:
+            self._active[project_path] -= 1
+            self._forget_if_unused(project_path)
+
+    async def _call_worker(self, project_path, cmd, env, request, timeout):
+        worker = await self._acquire(project_path, cmd, env)
+        try:
+            line = await worker.request(request, timeout)
+        except BaseException:
+            # A timed-out or cancelled worker may still answer later; never reuse it
+            await self._discard(worker)
+            raise
+
+        if not line:
+            await self._discard(worker)
+            return {"error": "".join(worker.stderr_tail) or "MCP server exited"}
+
+        worker.last_used = time.monotonic()
+        self._idle.setdefault(project_path, []).append(worker)
+        return _jsonrpc_result(_json_loads(line))
+
+    async def _acquire(self, project_path, cmd, env):
+        await self._reap_idle()
+        idle = self._idle.get(project_path)
+        while idle:
+            worker = idle.pop()
+            if worker.alive:
+                return worker
+            await self._discard(worker)
+
+        # The place is reserved before any await so concurrent callers never overshoot
+        # the cap; at the cap, the least recently used idle worker hands over its place
+        evicted = None
+        if self._live >= self.max_total_workers:
+            evicted = self._pop_least_recently_used()
+        if evicted is None:
+            self._live += 1
+        try:
+            if evicted is not None:
+                await evicted.close()
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=_MAX_RESPONSE_BYTES,
+            )
+        except BaseException:
+            self._live -= 1
+            raise
+        return _Worker(process)
+
+    async def _discard(self, worker):
+        """Shut down a worker that is no longer in any idle list"""
+        self._live -= 1
+        await worker.close()
+
+    def _pop_least_recently_used(self):
+        """Remove and return the idle worker, across all projects, used longest ago"""
+        project_path, worker = min(
+            ((path, worker) for path, idle in self._idle.items() for worker in idle),
+            key=lambda entry: entry[1].last_used,
+            default=(None, None),
+        )
+        if worker is not None:
+            self._idle[project_path].remove(worker)
+            self._forget_if_unused(project_path)
+        return worker
+
+    def _forget_if_unused(self, project_path):
+        """Drop a project's semaphore and idle list once nothing uses them"""
+        if not self._active.get(project_path) and not self._idle.get(project_path):
+            self._active.pop(project_path, None)
+            self._idle.pop(project_path, None)
+            self._slots.pop(project_path, None)
+
+    async def _reap_idle(self):
+        """Shut down workers that have been idle longer than idle_timeout"""
+        deadline = time.monotonic() - self.idle_timeout
+        for project_path, idle in list(self._idle.items()):
+            expired = [worker for worker in idle if worker.last_used < deadline]
+            if expired:
+                idle[:] = [worker for worker in idle if worker.last_used >= deadline]
+                self._forget_if_unused(project_path)
+                for worker in expired:
+                    await self._discard(worker)
+
+    async def close(self):
+        """Shut down every idle worker"""
+        idle, self._idle = self._idle, {}
+        for project_path, workers in idle.items():
+            self._forget_if_unused(project_path)
+            for worker in workers:
+                await self._discard(worker)
+
+
+async def _call_tool_async(pool, tool_name, arguments, project_path):
+    """Call the MCP server tool in-process or on a pooled worker process"""
+    server_class = _in_process_server_class()
+    if server_class is not None:
+        safe_project_path, error = _validate_tool_call(tool_name, project_path)
+        if error:
+            return error
+        return await _call_in_process(server_class, tool_name, arguments, safe_project_path)
+
+    cmd, env, request, error = _prepare_tool_call(tool_name, arguments, project_path)
+    if error:
+        return error
+
+    try:
+        # cmd[1] is the validated project path the worker serves
+        return await pool.call(cmd[1], cmd, env, request)
+    except asyncio.TimeoutError:
+        return _TIMEOUT_ERROR
+    except _JSONDecodeError as e:
+        return {"error": f"Invalid JSON response: {e}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def _handle_post(request):
+    """aiohttp counterpart of MCPBridgeHandler.do_POST"""
+    tool_name, arguments, project_path, error = _parse_tool_request(await request.read())
+    if error:
+        return web.Response(
+            status=400, body=_json_dumps({"error": error}), content_type="application/json"
+        )
+    if _rate_limited(request.remote):
+        return web.Response(
+            status=429,
+            body=_json_dumps({"error": "Too many tool calls, try again later"}),
+            content_type="application/json",
+        )
+
+    try:
+        # Call the MCP server
+        result = await _call_tool_async(
+            request.app["worker_pool"], tool_name, arguments, project_path
+        )
+
+        return web.Response(
+            body=_tool_response_body(result, project_path),
+            content_type="application/json",
+            headers=_CORS_HEADERS,
+        )
+
+    except Exception as e:
+        return web.Response(
+            status=500, body=_json_dumps({"error": str(e)}), content_type="application/json"
+        )
+
+
+async def _handle_health(request):
+    """aiohttp counterpart of MCPBridgeHandler.do_GET for /health"""
+    return web.Response(body=_health_body(), content_type="application/json")
+
+
+async def _handle_not_found(request):
+    """Unknown GET paths"""
+    return web.Response(status=404)
+
+
+async def _handle_options(request):
+    """aiohttp counterpart of MCPBridgeHandler.do_OPTIONS"""
+    return web.Response(headers=_PREFLIGHT_HEADERS)
+
+
+def create_app():
+    """Build the aiohttp application serving the bridge endpoints"""
+    app = web.Application(client_max_size=_MAX_BODY_BYTES)
+    app["worker_pool"] = WorkerPool()
+    app.on_cleanup.append(lambda app: app["worker_pool"].close())
+    app.router.add_get("/health", _handle_health)
+    # Like the HTTPServer handler, POST and OPTIONS are accepted on any path
+    # and any other GET is a 404
+    app.router.add_route("GET", "/{tail:.*}", _handle_not_found)
+    app.router.add_route("POST", "/{tail:.*}", _handle_post)
+    app.router.add_route("OPTIONS", "/{tail:.*}", _handle_options)
+    return app
+
+
+class _ReusePortHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer whose port can be shared by several bridge processes"""
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def _serve(host, port, reuse_port):
+    """Serve the bridge from this process until interrupted"""
+    if web is not None:
+        web.run_app(create_app(), host=host, port=port, reuse_port=reuse_port, print=None)
+        return
+
+    server_address = (host, port)
+    # One thread per request, so a slow tool call does not hold up /health or other calls
+    server_class = _ReusePortHTTPServer if reuse_port else ThreadingHTTPServer
+    httpd = server_class(server_address, MCPBridgeHandler)
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+def _serving_processes():
+    """
+    Number of processes to serve from, per MCP_BRIDGE_PROCESSES.
+
+    The processes share the port via SO_REUSEPORT; the kernel spreads connections
+    across them, sidestepping the GIL for JSON and request handling. Nothing else is
+    shared: each process has its own worker pool, in-process servers and rate limiter,
+    so worker caps multiply by the process count and a per-client limit would not
+    hold. Multiple processes are therefore refused while the rate limiter is enabled.
+    """
+    processes = int(os.getenv("MCP_BRIDGE_PROCESSES", "1"))
+    if processes > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        print("⚠️  SO_REUSEPORT is not available on this platform; using one process")
+        return 1
+    if processes > 1 and _RATE_LIMIT_REQUESTS > 0:
+        print("⚠️  MCP_BRIDGE_RATE_LIMIT is enforced per process; using one process")
+        return 1
+    return processes
+
+
 def start_bridge_server(port=8080):
     """Start the HTTP bridge server"""
     host = os.getenv("MCP_BRIDGE_HOST", "localhost")
     port = int(os.getenv("MCP_BRIDGE_PORT", port))
-
-    server_address = (host, port)
-    httpd = HTTPServer(server_address, MCPBridgeHandler)
+    processes = _serving_processes()
 
     print(f"🌐 MCP Bridge Server running on http://{host}:{port}")
     print("📁 Workspace-aware Android MCP bridge for VS Code")
     print(f"🔍 Health check: http://{host}:{port}/health")
+    if processes > 1:
+        print(f"⚙️  Serving from {processes} processes")
     print("\n📋 Usage in VS Code extension:")
     print(f"   POST http://{host}:{port}/ with JSON: {{tool: 'tool_name', arguments: {{...}}}}")
     print("   The bridge will automatically use the current VS Code workspace")
 
+    # Import the server module (or log why it cannot be) before the first request
+    _health_body()
+
+    reuse_port = processes > 1
+    children = [
+        multiprocessing.Process(target=_serve, args=(host, port, reuse_port), daemon=True)
+        for _ in range(processes - 1)
+    ]
+    for child in children:
+        child.start()
+
     try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
+        _serve(host, port, reuse_port)
+    finally:
+        for child in children:
+            child.terminate()
+            child.join()
         print("\n🛑 Bridge server stopped")
 
 
 if __name__ == "__main__":
-    import sys
-
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
     start_bridge_server(port)